@@ -4,21 +4,31 @@ Constants for MCP as a Judge.
 This module contains all static configuration values used throughout the application.
 """
 
+from typing import Final
+
 # LLM Configuration
-MAX_TOKENS = (
+MAX_TOKENS: Final = (
     25000  # Maximum tokens for all LLM requests - increased for comprehensive responses
 )
-DEFAULT_TEMPERATURE = 0.1  # Default temperature for LLM requests
-DEFAULT_REASONING_EFFORT = (
+DEFAULT_TEMPERATURE: Final = 0.1  # Default temperature for LLM requests
+DEFAULT_REASONING_EFFORT: Final = (
     "low"  # Default reasoning effort level - lowest for speed and efficiency
 )
 
 # Timeout Configuration
-DEFAULT_TIMEOUT = 30  # Default timeout in seconds for operations
+DEFAULT_TIMEOUT: Final = 30  # Default timeout in seconds for operations
 
 # Database Configuration
-DATABASE_URL = "sqlite://:memory:"
-MAX_SESSION_RECORDS = 20  # Maximum records to keep per session (FIFO)
-MAX_TOTAL_SESSIONS = 50  # Maximum total sessions to keep (LRU cleanup)
-MAX_CONTEXT_TOKENS = 50000  # Maximum tokens for session token (1 token ≈ 4 characters)
-MAX_RESPONSE_TOKENS = 5000  # Maximum tokens for LLM responses
+DATABASE_URL: Final = "sqlite://:memory:"
+MAX_SESSION_RECORDS: Final = 20  # Maximum records to keep per session (FIFO)
+MAX_TOTAL_SESSIONS: Final = 50  # Maximum total sessions to keep (LRU cleanup)
+MAX_CONTEXT_TOKENS: Final = (
+    50000  # Maximum tokens for session token (1 token ≈ 4 characters)
+)
+MAX_RESPONSE_TOKENS: Final = 5000  # Maximum tokens for LLM responses
+
+# Database Connection Configuration
+DATABASE_POOL_SIZE: Final = 5  # Persistent connections kept for file-based databases
+DATABASE_MAX_OVERFLOW: Final = 5  # Extra connections allowed under burst load
+DATABASE_POOL_RECYCLE: Final = 300  # Seconds before a pooled connection is replaced
+DATABASE_STATEMENT_CACHE_SIZE: Final = 512  # Compiled SQL statements cached per engine
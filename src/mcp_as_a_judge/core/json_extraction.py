@@ -0,0 +1,61 @@
+"""
+JSON extraction for LLM responses.
+
+Kept free of project imports so modules that ``server_helpers`` depends on
+(such as the workflow guidance) can use it without an import cycle.
+"""
+
+import re
+
+# A JSON string literal or a single brace; strings are matched whole so
+# braces inside them are skipped when balancing the object
+_JSON_BRACE_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}]', re.DOTALL)
+
+
+def extract_json_from_response(response_text: str) -> str:
+    """Extract the first JSON object from an LLM response.
+
+    LLMs often return JSON wrapped in markdown code blocks, explanatory text,
+    or other formatting. This function extracts just the JSON object content
+    without parsing it, so callers decode it exactly once (for example with
+    ``model_validate_json``). The object ends at the brace that balances the
+    first ``{``, so trailing prose containing braces is not included. If the
+    braces never balance, the span from the first ``{`` to the last ``}`` is
+    returned so the caller's parser reports the actual error.
+
+    Args:
+        response_text: Raw LLM response text
+
+    Returns:
+        Extracted JSON string ready for parsing
+
+    Raises:
+        ValueError: If no JSON object is found in the response
+    """
+    first_brace = response_text.find("{")
+    if first_brace != -1:
+        depth = 0
+        for token in _JSON_BRACE_TOKEN.finditer(response_text, first_brace):
+            if token.group() == "{":
+                depth += 1
+            elif token.group() == "}":
+                depth -= 1
+                if depth == 0:
+                    return response_text[first_brace : token.end()]
+
+    last_brace = response_text.rfind("}")
+
+    if first_brace == -1 or last_brace == -1 or first_brace >= last_brace:
+        response_info = {
+            "length": len(response_text),
+            "is_empty": not response_text or response_text.isspace(),
+            "first_100_chars": response_text[:100] if response_text else "None",
+            "contains_json_markers": "{" in response_text and "}" in response_text,
+        }
+        raise ValueError(
+            f"No valid JSON object found in response. "
+            f"Response info: {response_info}. "
+            f"Full response: '{response_text}'"
+        )
+
+    return response_text[first_brace : last_brace + 1]
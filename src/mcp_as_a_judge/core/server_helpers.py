@@ -5,17 +5,37 @@ This module contains utility functions used by the server for JSON processing,
 dynamic model generation, validation, and LLM configuration.
 """
 
+import copy
+import hashlib
 import json
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
 
 from mcp.server.fastmcp import Context
 from pydantic import BaseModel, Field
 
 from mcp_as_a_judge.core.constants import MAX_TOKENS
+from mcp_as_a_judge.core.json_extraction import extract_json_from_response
 from mcp_as_a_judge.core.logging_config import get_logger
 from mcp_as_a_judge.llm.llm_integration import load_llm_config_from_env
 from mcp_as_a_judge.messaging.llm_provider import llm_provider
+from mcp_as_a_judge.models import (
+    DynamicSchemaUserVars,
+    SystemVars,
+    ValidationErrorUserVars,
+)
 from mcp_as_a_judge.prompting.loader import create_separate_messages
 
+# LRU cache of AI-generated validation messages keyed by (issue, context digest)
+_VALIDATION_ERROR_CACHE_SIZE = 256
+_validation_error_cache: OrderedDict[tuple[str, bytes], str] = OrderedDict()
+
+# LRU cache of LLM-generated elicitation field definitions keyed by
+# (context, information_needed); current_understanding is deliberately ignored
+_ELICITATION_FIELDS_CACHE_SIZE = 64
+_elicitation_fields_cache: OrderedDict[tuple[str, str], dict] = OrderedDict()
+
 
 def get_session_id(ctx: Context) -> str:
     """Extract session_id from context, with fallback to default."""
@@ -44,53 +64,26 @@ def initialize_llm_configuration() -> None:
         )
 
 
-def extract_json_from_response(response_text: str) -> str:
-    """Extract JSON content from LLM response by finding first { and last }.
-
-    LLMs often return JSON wrapped in markdown code blocks, explanatory text,
-    or other formatting. This function extracts just the JSON object content.
-
-    Args:
-        response_text: Raw LLM response text
-
-    Returns:
-        Extracted JSON string ready for parsing
-
-    Raises:
-        ValueError: If no JSON object is found in the response
-    """
-    first_brace = response_text.find("{")
-    last_brace = response_text.rfind("}")
-
-    if first_brace == -1 or last_brace == -1 or first_brace >= last_brace:
-        response_info = {
-            "length": len(response_text),
-            "is_empty": len(response_text.strip()) == 0,
-            "first_100_chars": response_text[:100] if response_text else "None",
-            "contains_json_markers": "{" in response_text and "}" in response_text,
-        }
-        raise ValueError(
-            f"No valid JSON object found in response. "
-            f"Response info: {response_info}. "
-            f"Full response: '{response_text}'"
-        )
-
-    json_content = response_text[first_brace : last_brace + 1]
-    return json_content
-
-
 async def generate_validation_error_message(
     validation_issue: str,
     context: str,
     ctx: Context,
 ) -> str:
-    """Generate a descriptive error message using AI sampling for validation failures."""
-    try:
-        from mcp_as_a_judge.models import (
-            SystemVars,
-            ValidationErrorUserVars,
-        )
+    """Generate a descriptive error message using AI sampling for validation failures.
+
+    Messages are cached per (validation_issue, context) so repeated identical
+    failures do not trigger another sampling round trip.
+    """
+    cache_key = (
+        validation_issue,
+        hashlib.blake2b(context.encode(), digest_size=8).digest(),
+    )
+    cached = _validation_error_cache.get(cache_key)
+    if cached is not None:
+        _validation_error_cache.move_to_end(cache_key)
+        return cached
 
+    try:
         system_vars = SystemVars(max_tokens=MAX_TOKENS)
         user_vars = ValidationErrorUserVars(
             validation_issue=validation_issue, context=context
@@ -109,11 +102,16 @@ async def generate_validation_error_message(
             max_tokens=MAX_TOKENS,
             prefer_sampling=True,  # gitleaks:allow
         )
-        return response_text.strip()
+        message = response_text.strip()
 
     except Exception:
         return validation_issue
 
+    _validation_error_cache[cache_key] = message
+    if len(_validation_error_cache) > _VALIDATION_ERROR_CACHE_SIZE:
+        _validation_error_cache.popitem(last=False)
+    return message
+
 
 async def generate_dynamic_elicitation_model(
     context: str,
@@ -125,6 +123,8 @@ async def generate_dynamic_elicitation_model(
 
     This function uses LLM to generate field definitions and creates a proper
     Pydantic BaseModel class that's compatible with MCP elicitation.
+    Generated field definitions are cached per (context, information_needed),
+    so repeated elicitations for the same situation skip the LLM call.
 
     Args:
         context: Context about what information needs to be gathered
@@ -135,9 +135,13 @@ async def generate_dynamic_elicitation_model(
     Returns:
         Dynamically created Pydantic BaseModel class
     """
-    try:
-        from mcp_as_a_judge.models import DynamicSchemaUserVars, SystemVars
+    cache_key = (context, information_needed)
+    cached_fields = _elicitation_fields_cache.get(cache_key)
+    if cached_fields is not None:
+        _elicitation_fields_cache.move_to_end(cache_key)
+        return create_pydantic_model_from_fields(copy.deepcopy(cached_fields))
 
+    try:
         system_vars = SystemVars(max_tokens=MAX_TOKENS)
         user_vars = DynamicSchemaUserVars(
             context=context,
@@ -158,11 +162,15 @@ async def generate_dynamic_elicitation_model(
         )
 
         # Parse the field definitions JSON
-        fields_json = extract_json_from_response(schema_text)
-        fields_dict = json.loads(fields_json)
+        fields_dict = json.loads(extract_json_from_response(schema_text))
 
         # Convert field definitions to Pydantic model
-        return create_pydantic_model_from_fields(fields_dict)
+        dynamic_model = create_pydantic_model_from_fields(fields_dict)
+
+        _elicitation_fields_cache[cache_key] = copy.deepcopy(fields_dict)
+        if len(_elicitation_fields_cache) > _ELICITATION_FIELDS_CACHE_SIZE:
+            _elicitation_fields_cache.popitem(last=False)
+        return dynamic_model
 
     except Exception:
         # If dynamic generation fails, re-raise the exception
@@ -170,6 +178,34 @@ async def generate_dynamic_elicitation_model(
         raise
 
 
+@lru_cache(maxsize=128)
+def prettify_field_name(field_name: str) -> str:
+    """Turn a snake_case field name into a Title Case label.
+
+    Elicitation field names come from a small, repeating set, so labels are
+    cached.
+    """
+    return field_name.replace("_", " ").title()
+
+
+def format_elicitation_response(data: dict[str, Any], empty_message: str) -> str:
+    """Format non-empty elicitation answers as ``**Label:** value`` lines.
+
+    Args:
+        data: Field values returned by the elicitation form
+        empty_message: Text to return when every field is empty
+
+    Returns:
+        Markdown summary of the user's answers
+    """
+    response_summary = [
+        f"**{prettify_field_name(field_name)}:** {field_value}"
+        for field_name, field_value in data.items()
+        if field_value  # Only include non-empty values
+    ]
+    return "\n".join(response_summary) if response_summary else empty_message
+
+
 def create_pydantic_model_from_fields(fields_dict: dict) -> type[BaseModel]:
     """Convert field definitions to a Pydantic BaseModel class.
 
@@ -189,19 +225,17 @@ def create_pydantic_model_from_fields(fields_dict: dict) -> type[BaseModel]:
         if isinstance(field_config, dict):
             is_required = field_config.get("required", False)
             description = field_config.get(
-                "description", field_name.replace("_", " ").title()
+                "description", prettify_field_name(field_name)
             )
         elif isinstance(field_config, bool):
             # LLM returned boolean - treat as required flag
             is_required = field_config
-            description = field_name.replace("_", " ").title()
+            description = prettify_field_name(field_name)
         else:
             # LLM returned something else (string, etc.) - treat as description
             is_required = False
             description = (
-                str(field_config)
-                if field_config
-                else field_name.replace("_", " ").title()
+                str(field_config) if field_config else prettify_field_name(field_name)
             )
 
         # All fields are strings (text input) as per MCP elicitation constraints
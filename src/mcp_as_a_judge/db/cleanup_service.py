@@ -5,7 +5,9 @@ This service handles LRU-based cleanup operations for conversation history recor
 removing least recently used sessions when session limits are exceeded.
 """
 
-from sqlalchemy import Engine, func
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, Engine, delete, func
 from sqlmodel import Session, select
 
 from mcp_as_a_judge.core.constants import MAX_TOTAL_SESSIONS
@@ -103,19 +105,14 @@ class ConversationCleanupService:
             return 0
 
         with Session(self.engine) as session:
-            # Count records before deletion for logging
-            count_stmt = select(ConversationRecord).where(
+            # Single bulk DELETE; rowcount gives the number of records removed
+            delete_stmt = delete(ConversationRecord).where(
                 ConversationRecord.session_id.in_(  # type: ignore[attr-defined]
                     session_ids
                 )
             )
-            records_to_delete = session.exec(count_stmt).all()
-            delete_count = len(records_to_delete)
-
-            # Bulk delete all records for these sessions
-            for record in records_to_delete:
-                session.delete(record)
-
+            result = cast(CursorResult[Any], session.execute(delete_stmt))
+            delete_count = result.rowcount
             session.commit()
 
             logger.info(
@@ -157,16 +154,27 @@ class ConversationCleanupService:
             f"least recently used sessions"
         )
 
-        # Get least recently used sessions
-        lru_session_ids = self.get_least_recently_used_sessions(sessions_to_remove)
+        with Session(self.engine) as session:
+            # Select the LRU sessions and delete their records in one statement
+            lru_session_ids = (
+                select(ConversationRecord.session_id)
+                .group_by(ConversationRecord.session_id)
+                .order_by(func.max(ConversationRecord.timestamp).asc())
+                .limit(sessions_to_remove)
+            )
+            delete_stmt = delete(ConversationRecord).where(
+                ConversationRecord.session_id.in_(  # type: ignore[attr-defined]
+                    lru_session_ids
+                )
+            )
+            result = cast(CursorResult[Any], session.execute(delete_stmt))
+            deleted_count = result.rowcount
+            session.commit()
 
-        if not lru_session_ids:
+        if not deleted_count:
             logger.warning("🧹 No sessions found for LRU cleanup")
             return 0
 
-        # Delete all records for these sessions
-        deleted_count = self.delete_sessions(lru_session_ids)
-
         logger.info(
             f"✅ Session LRU cleanup completed: removed {sessions_to_remove} sessions, "
             f"deleted {deleted_count} records"
@@ -7,22 +7,46 @@ This service handles:
 3. Managing session-based conversation history
 """
 
+import asyncio
+import json
+from collections import OrderedDict
+from collections.abc import Coroutine
 from typing import Any
 
+from mcp_as_a_judge.core.constants import MAX_CONTEXT_TOKENS
 from mcp_as_a_judge.core.logging_config import get_logger
 from mcp_as_a_judge.db import (
     ConversationHistoryDB,
     ConversationRecord,
+    NewConversation,
     create_database_provider,
 )
 from mcp_as_a_judge.db.db_config import Config
-from mcp_as_a_judge.db.token_utils import (
-    filter_records_by_token_limit,
-)
+from mcp_as_a_judge.db.token_utils import calculate_tokens_in_string
 
 # Set up logger
 logger = get_logger(__name__)
 
+# Maximum number of (session, token budget) entries in a service's context cache
+_CONTEXT_CACHE_SIZE = 64
+
+
+def _extract_task_metadata_json(tool_output: str) -> str | None:
+    """Return the JSON of a tool output's current_task_metadata, if present."""
+    # Cheap substring check first; most outputs carry no metadata
+    if '"current_task_metadata"' not in tool_output:
+        return None
+    try:
+        output_data = json.loads(tool_output)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(output_data, dict):
+        return None
+    metadata = output_data.get("current_task_metadata")
+    if not isinstance(metadata, dict):
+        return None
+    return json.dumps(metadata)
+
 
 class ConversationHistoryService:
     """Service for managing conversation history in judge tools."""
@@ -39,6 +63,20 @@ class ConversationHistoryService:
         """
         self.config = config
         self.db = db_provider or create_database_provider(config)
+        # Read once; the history load runs on every judge tool call
+        self._max_session_records = config.database.max_session_records
+        # Group commit: saves issued while a batch is being written are
+        # queued here and written together by the running flush task
+        self._pending_saves: list[tuple[NewConversation, asyncio.Future[str]]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        # Saves scheduled without waiting for the write, including task
+        # metadata saves scheduled by the task manager; reads wait for them
+        self._background_saves: set[asyncio.Task[Any]] = set()
+        # Enrichment context by (session_id, token budget), with the provider
+        # write generation it was loaded at; any write makes entries stale
+        self._context_cache: OrderedDict[
+            tuple[str, int], tuple[int, list[ConversationRecord]]
+        ] = OrderedDict()
 
     async def load_filtered_context_for_enrichment(
         self, session_id: str, current_prompt: str = "", ctx: Any = None
@@ -58,23 +96,50 @@ class ConversationHistoryService:
         Returns:
             List of conversation records for LLM context (filtered for LLM limits)
         """
-        logger.info(f"Loading conversation history for session: {session_id}")
-
-        # Load all conversations for this session - database already contains
-        # records within storage limits, but we may need to filter further for LLM context
-        recent_records = await self.db.get_session_conversations(session_id)
-
-        logger.info(f"Retrieved {len(recent_records)} conversation records from DB")
-
-        # Apply LLM context filtering: ensure history + current prompt will fit within token limit
-        # This filters the list without modifying the database (only token limit matters for LLM)
-        # Pass ctx for accurate token counting when available
-        filtered_records = await filter_records_by_token_limit(
-            recent_records, current_prompt=current_prompt, ctx=ctx
+        logger.info("Loading conversation history for session: %s", session_id)
+        await self.wait_for_pending_saves()
+
+        # Database already contains records within storage limits, but history +
+        # current prompt must also fit within the LLM context. The token budget is
+        # applied in SQL (without modifying the database), so only the records
+        # that fit are loaded. Pass ctx for accurate token counting when available.
+        current_prompt_tokens = await calculate_tokens_in_string(
+            current_prompt, None, ctx
         )
+        # Every non-positive budget gives the same result; share one cache entry
+        token_budget = max(MAX_CONTEXT_TOKENS - current_prompt_tokens, 0)
+        cache_key = (session_id, token_budget)
+        write_generation = self.db.write_generation
+        cached = self._context_cache.get(cache_key)
+        if cached is not None and cached[0] == write_generation:
+            self._context_cache.move_to_end(cache_key)
+            filtered_records = list(cached[1])
+        else:
+            if token_budget == 0:
+                # The prompt alone fills the context: only the most recent
+                # record, which is always kept, can be returned, so skip the
+                # budget query
+                filtered_records = await self.db.get_session_conversations(
+                    session_id, limit=1
+                )
+            else:
+                filtered_records = (
+                    await self.db.get_session_conversations_within_budget(
+                        session_id,
+                        token_budget=token_budget,
+                        limit=self._max_session_records,
+                    )
+                )
+            # Stored with the generation read before the query, so a write that
+            # lands while loading leaves the entry stale rather than wrong
+            self._context_cache[cache_key] = (write_generation, filtered_records)
+            self._context_cache.move_to_end(cache_key)
+            if len(self._context_cache) > _CONTEXT_CACHE_SIZE:
+                self._context_cache.popitem(last=False)
+            filtered_records = list(filtered_records)
 
         logger.info(
-            f"Returning {len(filtered_records)} conversation records for LLM context"
+            "Returning %d conversation records for LLM context", len(filtered_records)
         )
         return filtered_records
 
@@ -99,19 +164,171 @@ class ConversationHistoryService:
             ID of the created conversation record
         """
         logger.info(
-            f"Saving tool interaction to SQLite DB for session: {session_id}, tool: {tool_name}"
+            "Saving tool interaction to SQLite DB for session: %s, tool: %s",
+            session_id,
+            tool_name,
         )
 
-        record_id = await self.db.save_conversation(
-            session_id=session_id,
-            source=tool_name,
-            input_data=tool_input,
-            output=tool_output,
+        task_metadata = _extract_task_metadata_json(tool_output)
+        loop = asyncio.get_running_loop()
+        if self._flush_task is not None and self._flush_task.get_loop() is not loop:
+            # Left behind by an event loop that stopped before it could flush
+            # (e.g. an earlier asyncio.run()); those saves can never complete
+            self._pending_saves = []
+            self._flush_task = None
+        saved: asyncio.Future[str] = loop.create_future()
+        self._pending_saves.append(
+            (
+                NewConversation(
+                    session_id=session_id,
+                    source=tool_name,
+                    input_data=tool_input,
+                    output=tool_output,
+                    task_metadata=task_metadata,
+                ),
+                saved,
+            )
         )
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_pending_saves())
+        record_id = await saved
 
-        logger.info(f"Saved conversation record with ID: {record_id}")
+        logger.debug("Saved conversation record with ID: %s", record_id)
         return record_id
 
+    def schedule_tool_interaction_save(
+        self, session_id: str, tool_name: str, tool_input: str, tool_output: str
+    ) -> None:
+        """
+        Save a tool interaction without waiting for the write.
+
+        Lets tools respond before the record is committed. Reads through this
+        service wait for scheduled saves first, so they still see the record;
+        use wait_for_pending_saves() to flush them explicitly (e.g. on shutdown).
+
+        Args:
+            session_id: Session identifier from AI agent
+            tool_name: Name of the judge tool (e.g., 'judge_coding_plan')
+            tool_input: Input that was passed to the tool
+            tool_output: Output/result from the tool
+        """
+        self.schedule_background_save(
+            self.save_tool_interaction_and_cleanup(
+                session_id=session_id,
+                tool_name=tool_name,
+                tool_input=tool_input,
+                tool_output=tool_output,
+            )
+        )
+
+    def schedule_background_save(self, save: Coroutine[Any, Any, Any]) -> None:
+        """
+        Run a save through this service in the background.
+
+        The task is tracked with the service's other background saves, so
+        reads through this service and wait_for_pending_saves() wait for it.
+
+        Args:
+            save: Coroutine that performs the save
+        """
+        save_task = asyncio.create_task(save)
+        self._background_saves.add(save_task)
+        save_task.add_done_callback(self._background_save_done)
+
+    def _background_save_done(self, save_task: asyncio.Task[Any]) -> None:
+        """Forget a finished background save, logging it if it failed."""
+        self._background_saves.discard(save_task)
+        if not save_task.cancelled() and save_task.exception() is not None:
+            logger.error("Failed to save tool interaction: %s", save_task.exception())
+
+    async def wait_for_pending_saves(self) -> None:
+        """Wait for all saves scheduled in the background."""
+        loop = asyncio.get_running_loop()
+        # Saves scheduled on an event loop that has since stopped cannot be
+        # awaited from this one and will never finish, so forget them
+        self._background_saves = {
+            t for t in self._background_saves if t.get_loop() is loop
+        }
+        if self._background_saves:
+            await asyncio.gather(*self._background_saves, return_exceptions=True)
+
+    async def _flush_pending_saves(self) -> None:
+        """Write queued saves in batches until the queue is empty."""
+        try:
+            # Let saves issued in the same event loop iteration join the batch
+            await asyncio.sleep(0)
+            while self._pending_saves:
+                batch, self._pending_saves = self._pending_saves, []
+                try:
+                    record_ids = await self.db.save_conversations(
+                        [record for record, _ in batch]
+                    )
+                except BaseException as e:
+                    for _, saved in batch:
+                        if saved.done():
+                            continue
+                        if isinstance(e, Exception):
+                            saved.set_exception(e)
+                        else:
+                            saved.cancel()
+                    if not isinstance(e, Exception):
+                        raise
+                    continue
+                for (_, saved), record_id in zip(batch, record_ids, strict=True):
+                    if not saved.done():
+                        saved.set_result(record_id)
+        finally:
+            self._flush_task = None
+            # Only reached with queued saves if the flush task was cancelled
+            pending, self._pending_saves = self._pending_saves, []
+            for _, saved in pending:
+                saved.cancel()
+
+    async def get_task_metadata_snapshots(
+        self, session_id: str, limit: int | None = None
+    ) -> list[str]:
+        """
+        Get the task metadata snapshots recorded for a session.
+
+        Unlike the enrichment context, this is not trimmed to the LLM token
+        budget and skips records that carry no metadata.
+
+        Args:
+            session_id: Session identifier (the task_id)
+            limit: Maximum number of snapshots to return
+
+        Returns:
+            Task metadata JSON strings, most recent first
+        """
+        await self.wait_for_pending_saves()
+        return await self.db.get_task_metadata_snapshots(session_id, limit)
+
+    async def get_recent_sessions(self, limit: int = 10) -> list[tuple[str, int]]:
+        """
+        Get the most recently active sessions, including scheduled saves.
+
+        Args:
+            limit: Maximum number of sessions to return
+
+        Returns:
+            (session_id, last_activity_timestamp) tuples, most recent first
+        """
+        await self.wait_for_pending_saves()
+        return await self.db.get_recent_sessions(limit)
+
+    async def delete_previous_plan(self, session_id: str) -> None:
+        """
+        Delete all judge_coding_plan records of a session except the latest.
+
+        Waits for scheduled saves first, so a plan record still being written
+        in the background is taken into account.
+
+        Args:
+            session_id: Session identifier
+        """
+        await self.wait_for_pending_saves()
+        await self.db.delete_previous_plan(session_id)
+
     async def get_conversation_history(
         self, session_id: str
     ) -> list[ConversationRecord]:
@@ -124,12 +341,14 @@ class ConversationHistoryService:
         Returns:
             List of conversation records for the session (most recent first)
         """
-        logger.info(f"Loading conversation history for session {session_id}")
+        logger.info("Loading conversation history for session %s", session_id)
 
         context_records = await self.load_filtered_context_for_enrichment(session_id)
 
         logger.info(
-            f"Retrieved {len(context_records)} conversation records for session {session_id}"
+            "Retrieved %d conversation records for session %s",
+            len(context_records),
+            session_id,
         )
 
         return context_records
@@ -150,19 +369,19 @@ class ConversationHistoryService:
             return []
 
         logger.info(
-            f"Formatting {len(conversation_history)} conversation records as JSON array"
+            "Formatting %d conversation records as JSON array",
+            len(conversation_history),
         )
 
-        json_array = []
-        for record in conversation_history:
-            json_array.append(
-                {
-                    "source": record.source,
-                    "input": record.input,
-                    "output": record.output,
-                    "timestamp": record.timestamp,  # Already epoch int
-                }
-            )
-
-        logger.info(f"Generated JSON array with {len(json_array)} records")
+        json_array = [
+            {
+                "source": record.source,
+                "input": record.input,
+                "output": record.output,
+                "timestamp": record.timestamp,  # Already epoch int
+            }
+            for record in conversation_history
+        ]
+
+        logger.info("Generated JSON array with %d records", len(json_array))
         return json_array
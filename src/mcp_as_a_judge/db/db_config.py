@@ -5,13 +5,33 @@ This module handles database configuration logic, including provider detection
 and configuration classes.
 """
 
+from functools import lru_cache
+
 from mcp_as_a_judge.core.constants import (
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_RECYCLE,
+    DATABASE_POOL_SIZE,
+    DATABASE_STATEMENT_CACHE_SIZE,
     DATABASE_URL,
     MAX_SESSION_RECORDS,
     MAX_TOTAL_SESSIONS,
 )
 
+# URLs that select the SQLite in-memory provider
+_IN_MEMORY_URLS = frozenset({"sqlite://:memory:", ":memory:"})
+
+# Scheme prefixes per provider, checked in order after the in-memory/SQLite rules
+_PROVIDER_PREFIXES: tuple[tuple[tuple[str, ...], str], ...] = (
+    (("postgresql://", "postgres://"), "postgresql"),
+    (("mysql://", "mysql+"), "mysql"),
+)
+
+# Enough of the URL to match every scheme and in-memory URL above
+_URL_HEAD_LENGTH = max(len(u) for u in _IN_MEMORY_URLS)
 
+
+# Memoized: every provider creation resolves the same few configured URLs
+@lru_cache(maxsize=32)
 def get_database_provider_from_url(url: str) -> str:
     """
     Determine database provider from URL.
@@ -29,30 +49,27 @@ def get_database_provider_from_url(url: str) -> str:
         "postgresql://..." -> "postgresql"
         "mysql://..." -> "mysql"
     """
-    if not url or url.strip() == "":
+    url = url.strip() if url else ""
+    if not url:
         return "in_memory"
 
-    url_lower = url.lower().strip()
+    # Only lowercase the part of the URL the scheme checks look at
+    url_head = url[:_URL_HEAD_LENGTH].lower()
 
     # SQLite in-memory
-    if url_lower == "sqlite://:memory:" or url_lower == ":memory:":
+    if len(url) <= _URL_HEAD_LENGTH and url_head in _IN_MEMORY_URLS:
         return "in_memory"
 
     # SQLite file
-    elif url_lower.startswith("sqlite://") or url_lower.endswith(".db"):
+    if url_head.startswith("sqlite://") or url[-3:].lower() == ".db":
         return "sqlite"
 
-    # PostgreSQL
-    elif url_lower.startswith("postgresql://") or url_lower.startswith("postgres://"):
-        return "postgresql"
-
-    # MySQL
-    elif url_lower.startswith("mysql://") or url_lower.startswith("mysql+"):
-        return "mysql"
+    for prefixes, provider in _PROVIDER_PREFIXES:
+        if url_head.startswith(prefixes):
+            return provider
 
-    else:
-        # Default to in_memory for unknown URLs
-        return "in_memory"
+    # Default to in_memory for unknown URLs
+    return "in_memory"
 
 
 class DatabaseConfig:
@@ -62,6 +79,11 @@ class DatabaseConfig:
         self.url = DATABASE_URL
         self.max_session_records = MAX_SESSION_RECORDS
         self.max_total_sessions = MAX_TOTAL_SESSIONS
+        # Connection pool and compiled statement cache settings
+        self.pool_size = DATABASE_POOL_SIZE
+        self.max_overflow = DATABASE_MAX_OVERFLOW
+        self.pool_recycle = DATABASE_POOL_RECYCLE
+        self.statement_cache_size = DATABASE_STATEMENT_CACHE_SIZE
 
 
 class Config:
@@ -51,12 +51,17 @@ class DatabaseFactory:
         provider_class = cls._providers[provider_name]
 
         # Create provider instance - call concrete implementation constructor
-        # All current providers accept max_session_records and url parameters
+        # All current providers accept max_session_records, url and the
+        # connection pool / statement cache parameters
         return cast(
             ConversationHistoryDB,
             provider_class(
                 max_session_records=config.database.max_session_records,
                 url=config.database.url,
+                pool_size=config.database.pool_size,
+                max_overflow=config.database.max_overflow,
+                pool_recycle=config.database.pool_recycle,
+                statement_cache_size=config.database.statement_cache_size,
             ),
         )
 
@@ -80,15 +85,52 @@ class DatabaseFactory:
         cls._providers[name] = provider_class
 
 
+# Providers for persistent databases, keyed by their settings
+_shared_providers: dict[tuple[Any, ...], ConversationHistoryDB] = {}
+
+
 # Convenience function
 def create_database_provider(config: Config) -> ConversationHistoryDB:
     """
     Create a database provider based on configuration.
 
+    Providers for persistent databases are shared between calls with the same
+    settings, so they reuse a single engine and connection pool. In-memory
+    providers are always new, as each one is a separate database.
+
     Args:
         config: Application configuration
 
     Returns:
         ConversationHistoryDB instance
     """
-    return DatabaseFactory.create_provider(config)
+    database = config.database
+    if get_database_provider_from_url(database.url) == "in_memory":
+        return DatabaseFactory.create_provider(config)
+
+    key = (
+        database.url,
+        database.max_session_records,
+        database.pool_size,
+        database.max_overflow,
+        database.pool_recycle,
+        database.statement_cache_size,
+    )
+    provider = _shared_providers.get(key)
+    if provider is None:
+        provider = _shared_providers[key] = DatabaseFactory.create_provider(config)
+    return provider
+
+
+def close_shared_providers() -> None:
+    """
+    Close and forget the providers shared by create_database_provider.
+
+    Their engines are disposed, so connection pools on persistent databases
+    are not kept open for the rest of the process. Later calls create new
+    providers.
+    """
+    providers = list(_shared_providers.values())
+    _shared_providers.clear()
+    for provider in providers:
+        provider.close()
@@ -7,7 +7,9 @@ must implement for storing and retrieving conversation history.
 
 import time
 from abc import ABC, abstractmethod
+from typing import NotRequired, TypedDict
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 
@@ -15,9 +17,28 @@ class ConversationRecord(SQLModel, table=True):
     """SQLModel for conversation history records."""
 
     __tablename__ = "conversation_history"
+    __table_args__ = (
+        # Serves per-session history in (timestamp, id) order without a sort
+        # step and MAX(timestamp) per session for LRU cleanup; also covers
+        # lookups by session_id alone, so neither column has its own index
+        Index("idx_session_timestamp", "session_id", "timestamp", "id"),
+        # One tool's records in a session, newest first (previous coding plan
+        # cleanup)
+        Index(
+            "idx_session_source_timestamp", "session_id", "source", "timestamp", "id"
+        ),
+        # Partial index so task metadata lookups only touch records carrying it
+        Index(
+            "idx_task_meta",
+            "session_id",
+            "timestamp",
+            sqlite_where=text("task_metadata IS NOT NULL"),
+            postgresql_where=text("task_metadata IS NOT NULL"),
+        ),
+    )
 
     id: str | None = Field(default=None, primary_key=True)
-    session_id: str = Field(index=True)
+    session_id: str
     source: str  # tool name
     input: str  # tool input query
     output: str  # tool output string
@@ -25,16 +46,38 @@ class ConversationRecord(SQLModel, table=True):
         default=0
     )  # combined token count for input + output (1 token ≈ 4 characters)
     timestamp: int = Field(
-        default_factory=lambda: int(time.time()), index=True
-    )  # when the record was created (epoch seconds)
+        default_factory=time.time_ns
+    )  # when the record was created (epoch nanoseconds, as stored by providers)
+    task_metadata: str | None = Field(
+        default=None
+    )  # JSON of the output's current_task_metadata, if it carries one
+
+
+class NewConversation(TypedDict):
+    """Fields of a conversation record to be saved with save_conversations."""
+
+    session_id: str
+    source: str
+    input_data: str
+    output: str
+    task_metadata: NotRequired[str | None]
 
 
 class ConversationHistoryDB(ABC):
     """Abstract interface for conversation history database operations."""
 
+    # Incremented by providers after every write or delete, so callers can
+    # tell whether records they read earlier may be stale
+    write_generation: int = 0
+
     @abstractmethod
     async def save_conversation(
-        self, session_id: str, source: str, input_data: str, output: str
+        self,
+        session_id: str,
+        source: str,
+        input_data: str,
+        output: str,
+        task_metadata: str | None = None,
     ) -> str:
         """
         Save a conversation record to the database.
@@ -44,15 +87,34 @@ class ConversationHistoryDB(ABC):
             source: Tool name that generated this record
             input_data: Tool input query
             output: Tool output string
+            task_metadata: JSON of the task metadata carried by the output, if any
 
         Returns:
             The ID of the created record
         """
         pass
 
+    @abstractmethod
+    async def save_conversations(self, records: list[NewConversation]) -> list[str]:
+        """
+        Save several conversation records in a single transaction.
+
+        Cleanup runs once per affected session after the batch is written.
+
+        Args:
+            records: Records to save, in the order they happened
+
+        Returns:
+            The IDs of the created records, in the same order
+        """
+        pass
+
     @abstractmethod
     async def get_session_conversations(
-        self, session_id: str, limit: int | None = None
+        self,
+        session_id: str,
+        limit: int | None = None,
+        before_id: str | None = None,
     ) -> list[ConversationRecord]:
         """
         Retrieve all conversation records for a session.
@@ -60,12 +122,51 @@ class ConversationHistoryDB(ABC):
         Args:
             session_id: Session identifier
             limit: Maximum number of records to return (most recent first)
+            before_id: Pagination cursor; only return records older than the
+                record with this ID (the last record of the previous page)
 
         Returns:
             List of ConversationRecord objects
         """
         pass
 
+    @abstractmethod
+    async def get_session_conversations_within_budget(
+        self, session_id: str, token_budget: int, limit: int | None = None
+    ) -> list[ConversationRecord]:
+        """
+        Retrieve the most recent conversation records that fit a token budget.
+
+        Records are taken newest first while their combined tokens stay within
+        the budget. The most recent record is always returned, even if it alone
+        exceeds the budget.
+
+        Args:
+            session_id: Session identifier
+            token_budget: Maximum combined tokens of the returned records
+            limit: Maximum number of records to return
+
+        Returns:
+            List of ConversationRecord objects (most recent first)
+        """
+        pass
+
+    @abstractmethod
+    async def get_task_metadata_snapshots(
+        self, session_id: str, limit: int | None = None
+    ) -> list[str]:
+        """
+        Retrieve task metadata snapshots stored for a session.
+
+        Args:
+            session_id: Session identifier
+            limit: Maximum number of snapshots to return (most recent first)
+
+        Returns:
+            List of task metadata JSON strings, most recent first
+        """
+        pass
+
     @abstractmethod
     async def get_recent_sessions(self, limit: int = 10) -> list[tuple[str, int]]:
         """
@@ -91,3 +192,12 @@ class ConversationHistoryDB(ABC):
             session_id: Session identifier
         """
         pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Release the provider's connections.
+
+        A closed provider may still be used, reconnecting as needed.
+        """
+        pass
@@ -5,21 +5,100 @@ This provider uses SQLModel with SQLAlchemy for type-safe database operations.
 It supports both in-memory (:memory:) and file-based SQLite storage.
 """
 
+import asyncio
+import os
 import time
-import uuid
-
-from sqlalchemy import create_engine, delete, func
-from sqlmodel import Session, SQLModel, asc, desc, select
-
-from mcp_as_a_judge.core.constants import MAX_CONTEXT_TOKENS
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
+
+from sqlalchemy import (
+    CursorResult,
+    Subquery,
+    and_,
+    create_engine,
+    delete,
+    event,
+    func,
+    inspect,
+    or_,
+    text,
+)
+from sqlmodel import Session, SQLModel, col, desc, select
+
+from mcp_as_a_judge.core.constants import (
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_RECYCLE,
+    DATABASE_POOL_SIZE,
+    DATABASE_STATEMENT_CACHE_SIZE,
+    MAX_CONTEXT_TOKENS,
+)
 from mcp_as_a_judge.core.logging_config import get_logger
 from mcp_as_a_judge.db.cleanup_service import ConversationCleanupService
-from mcp_as_a_judge.db.interface import ConversationHistoryDB, ConversationRecord
-from mcp_as_a_judge.db.token_utils import calculate_tokens_in_record, detect_model_name
+from mcp_as_a_judge.db.interface import (
+    ConversationHistoryDB,
+    ConversationRecord,
+    NewConversation,
+)
+from mcp_as_a_judge.db.token_utils import calculate_tokens_in_record
 
 # Set up logger
 logger = get_logger(__name__)
 
+_T = TypeVar("_T")
+
+# Applied to every new connection of a file-based database: WAL lets readers
+# run alongside the writer and, with synchronous=NORMAL, commits need a
+# single fsync instead of two
+_FILE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+)
+
+# In-memory databases have no journal to tune, but still benefit from keeping
+# temporary sort/index structures in memory and from a larger page cache
+_MEMORY_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB
+)
+
+
+def _execute_pragmas(dbapi_connection: Any, pragmas: tuple[str, ...]) -> None:
+    """Run the given PRAGMA statements on a raw SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _apply_file_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Configure a new SQLite connection for a file-based database."""
+    _execute_pragmas(dbapi_connection, _FILE_PRAGMAS)
+
+
+def _apply_memory_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Configure a new SQLite connection for an in-memory database."""
+    _execute_pragmas(dbapi_connection, _MEMORY_PRAGMAS)
+
+
+def _new_record_id(timestamp_ns: int) -> str:
+    """
+    Generate a time-ordered UUIDv7 record ID (RFC 9562).
+
+    The millisecond timestamp leads the ID, so new primary keys land at the
+    end of the B-tree instead of at random pages as with uuid4. Stored as 32
+    hex digits without dashes, which keeps keys short and still sortable.
+    """
+    unix_ms = timestamp_ns // 1_000_000
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10))
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return f"{value:032x}"
+
 
 class SQLiteProvider(ConversationHistoryDB):
     """
@@ -39,21 +118,60 @@ class SQLiteProvider(ConversationHistoryDB):
     - Session-based conversation retrieval
     """
 
-    def __init__(self, max_session_records: int = 20, url: str = "") -> None:
+    def __init__(
+        self,
+        max_session_records: int = 20,
+        url: str = "",
+        pool_size: int = DATABASE_POOL_SIZE,
+        max_overflow: int = DATABASE_MAX_OVERFLOW,
+        pool_recycle: int = DATABASE_POOL_RECYCLE,
+        statement_cache_size: int = DATABASE_STATEMENT_CACHE_SIZE,
+    ) -> None:
         """Initialize the SQLModel SQLite database with LRU and time-based cleanup."""
         # Parse URL to get SQLite connection string
         connection_string = self._parse_sqlite_url(url)
+        in_memory = ":memory:" in connection_string
+
+        # In-memory databases live in a single connection per thread, so pool
+        # sizing only applies to file-based storage. No pre-ping: a local file
+        # connection cannot go stale the way a network connection can.
+        pool_args: dict[str, int] = (
+            {}
+            if in_memory
+            else {
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_recycle": pool_recycle,
+            }
+        )
+
+        # sqlite3 keeps prepared statements per connection, keyed by SQL text,
+        # so identical queries skip re-parsing and re-planning
+        connect_args: dict[str, int | bool] = {
+            "cached_statements": statement_cache_size
+        }
+        if in_memory:
+            connect_args["check_same_thread"] = False
 
         # Create SQLAlchemy engine
         self.engine = create_engine(
             connection_string,
             echo=False,  # Set to True for SQL debugging
-            connect_args={"check_same_thread": False}
-            if ":memory:" in connection_string
-            else {},
+            connect_args=connect_args,
+            # Compiled statements are reused across calls instead of re-rendered
+            query_cache_size=statement_cache_size,
+            **pool_args,
+        )
+
+        # Pragmas are applied once per new connection, not per query
+        event.listen(
+            self.engine,
+            "connect",
+            _apply_memory_pragmas if in_memory else _apply_file_pragmas,
         )
 
         self._max_session_records = max_session_records
+        self._in_memory = in_memory
 
         # Initialize cleanup service for LRU session cleanup
         self._cleanup_service = ConversationCleanupService(engine=self.engine)
@@ -82,7 +200,19 @@ class SQLiteProvider(ConversationHistoryDB):
 
     def _create_tables(self) -> None:
         """Create database tables using SQLModel."""
+        table_name = ConversationRecord.__tablename__
+        if inspect(self.engine).has_table(table_name):
+            # Add columns introduced after the table was first created
+            columns = {c["name"] for c in inspect(self.engine).get_columns(table_name)}
+            if "task_metadata" not in columns:
+                with self.engine.begin() as connection:
+                    connection.execute(
+                        text(f"ALTER TABLE {table_name} ADD COLUMN task_metadata TEXT")
+                    )
         SQLModel.metadata.create_all(self.engine)
+        # create_all skips indexes of tables that already exist
+        for index in ConversationRecord.__table__.indexes:  # type: ignore[attr-defined]
+            index.create(self.engine, checkfirst=True)
         logger.info("Created conversation_history table with SQLModel")
 
     def _cleanup_excess_sessions(self) -> int:
@@ -94,270 +224,369 @@ class SQLiteProvider(ConversationHistoryDB):
         """
         return self._cleanup_service.cleanup_excess_sessions()
 
-    async def _cleanup_old_messages(self, session_id: str) -> int:
+    async def _run_blocking(self, work: Callable[[], _T]) -> _T:
         """
-        Remove old messages from a session using token-based FIFO cleanup.
-
-        Uses dynamic token limits based on current model (get_llm_input_limit).
-        Removes oldest records until total tokens are within the model's input limit.
+        Run blocking database work without stalling the event loop.
 
-        Optimization: Single DB query with ORDER BY, then in-memory list operations.
+        File-based databases run the work on a worker thread. In-memory
+        databases live in one connection per thread, so their work has to run
+        on the calling thread's connection.
         """
-        with Session(self.engine) as session:
-            # Get current records ordered by timestamp DESC (newest first for token calculation)
-            count_stmt = (
-                select(ConversationRecord)
-                .where(ConversationRecord.session_id == session_id)
-                .order_by(
-                    desc(ConversationRecord.timestamp),
-                    desc(ConversationRecord.id),
-                )
-            )
-            current_records = list(session.exec(count_stmt).all())
-            current_count = len(current_records)
-
-            logger.info(
-                f"Cleanup check for session {session_id}: {current_count} records "
-                f"(max: {self._max_session_records})"
-            )
+        if self._in_memory:
+            return work()
+        return await asyncio.to_thread(work)
 
-            removed_count = 0
-
-            # STEP 1: Handle record count limit
-            while len(current_records) > self._max_session_records:
-                logger.info("   📊 Record limit exceeded, removing oldest record")
-                # Deterministically fetch oldest by ascending timestamp then id
-                oldest_stmt = (
-                    select(ConversationRecord)
-                    .where(ConversationRecord.session_id == session_id)
-                    .order_by(
-                        asc(ConversationRecord.timestamp), asc(ConversationRecord.id)
-                    )
-                    .limit(1)
-                )
-                oldest_record = session.exec(oldest_stmt).first()
-                if not oldest_record:
-                    break
-                logger.info(
-                    f"   🗑️ Removing oldest record: {oldest_record.source} | {getattr(oldest_record, 'tokens', 0)} tokens | {oldest_record.timestamp}"
-                )
-                session.delete(oldest_record)
-                removed_count += 1
-                session.commit()
-                # Update in-memory list
-                current_records = [
-                    r for r in current_records if r.id != oldest_record.id
-                ]
+    def _cleanup_old_messages(self, session: Session, session_id: str) -> int:
+        """
+        Remove old messages from a session using token-based FIFO cleanup.
 
-            # STEP 2: Handle token limit using dynamic model-specific limits
-            current_tokens = sum(record.tokens for record in current_records)
+        Keeps the newest records up to the record limit whose running token
+        total stays within MAX_CONTEXT_TOKENS, and removes the rest.
 
-            # Use configured MAX_CONTEXT_TOKENS for persistent storage limits
-            model_name = await detect_model_name()
-            max_input_tokens = MAX_CONTEXT_TOKENS
+        Runs inside the caller's transaction and leaves the commit to it, so a
+        save and its cleanup share a single commit.
 
-            logger.info(
-                f"   {len(current_records)} records, {current_tokens} tokens "
-                f"(max: {max_input_tokens} for model: {model_name or 'default'})"
+        Optimization: a single DELETE; SQLite ranks the session's records
+        itself, so no COUNT query is needed and no records are loaded.
+        """
+        ranked = self._rank_session_records(session_id)
+        stale_ids = select(ranked.c.id).where(
+            or_(
+                ranked.c.position > self._max_session_records,
+                ranked.c.running_tokens > MAX_CONTEXT_TOKENS,
             )
-
-            if current_tokens > max_input_tokens:
-                logger.info(
-                    f"   🚨 Token limit exceeded, removing oldest records to fit within {max_input_tokens} tokens"
+        )
+        result = cast(
+            CursorResult[Any],
+            session.execute(
+                delete(ConversationRecord).where(
+                    col(ConversationRecord.id).in_(stale_ids)
                 )
+            ),
+        )
+        removed_count = result.rowcount
 
-                # Calculate which records to keep (newest first, within token limit)
-                records_to_keep = []
-                running_tokens = 0
-
-                for record in current_records:  # Already ordered newest first
-                    if running_tokens + record.tokens <= max_input_tokens:
-                        records_to_keep.append(record)
-                        running_tokens += record.tokens
-                    else:
-                        break
-
-                # Remove records that didn't make the cut
-                records_to_remove_for_tokens = current_records[len(records_to_keep) :]
-
-                if records_to_remove_for_tokens:
-                    logger.info(
-                        f"   🗑️ Removing {len(records_to_remove_for_tokens)} records for token limit "
-                        f"(keeping {len(records_to_keep)} records, {running_tokens} tokens)"
-                    )
-
-                    for record in records_to_remove_for_tokens:
-                        logger.info(
-                            f"      - {record.source} | {record.tokens} tokens | {record.timestamp}"
-                        )
-                        session.delete(record)
-                        removed_count += 1
+        if removed_count > 0:
+            logger.info(
+                "✅ Cleanup completed for session %s: removed %s records "
+                "(max: %s records, %s tokens)",
+                session_id,
+                removed_count,
+                self._max_session_records,
+                MAX_CONTEXT_TOKENS,
+            )
+        else:
+            logger.debug(
+                "   ✅ No cleanup needed for session %s - within both limits",
+                session_id,
+            )
 
-                    session.commit()
-                    logger.info(
-                        f"   ✅ Removed {len(records_to_remove_for_tokens)} additional records due to token limit"
-                    )
+        return removed_count
 
-            if removed_count > 0:
-                logger.info(
-                    f"✅ Cleanup completed for session {session_id}: removed {removed_count} total records"
-                )
-            else:
-                logger.info("   ✅ No cleanup needed - within both limits")
+    @staticmethod
+    def _rank_session_records(session_id: str) -> Subquery:
+        """
+        Rank a session's records from the newest backwards.
 
-            return removed_count
+        Each row carries its record id, its position (1 = newest) and the
+        running token total up to and including it.
+        """
+        newest_first = (
+            desc(ConversationRecord.timestamp),
+            desc(ConversationRecord.id),
+        )
+        return (
+            select(
+                col(ConversationRecord.id).label("id"),
+                func.sum(ConversationRecord.tokens)
+                .over(order_by=newest_first, rows=(None, 0))
+                .label("running_tokens"),
+                func.row_number().over(order_by=newest_first).label("position"),
+            )
+            .where(ConversationRecord.session_id == session_id)
+            .subquery()
+        )
 
     def _is_new_session(self, session_id: str) -> bool:
         """Check if this is a new session (no existing records)."""
         with Session(self.engine) as session:
-            existing_record = session.exec(
-                select(ConversationRecord)
+            # Only the key is needed; avoids loading the input/output payloads
+            existing_record_id = session.exec(
+                select(ConversationRecord.id)
                 .where(ConversationRecord.session_id == session_id)
                 .limit(1)
             ).first()
-            return existing_record is None
+            return existing_record_id is None
 
     async def save_conversation(
-        self, session_id: str, source: str, input_data: str, output: str
+        self,
+        session_id: str,
+        source: str,
+        input_data: str,
+        output: str,
+        task_metadata: str | None = None,
     ) -> str:
         """Save a conversation record to SQLite database with LRU cleanup."""
-        record_id = str(uuid.uuid4())
-        # Nanosecond precision to avoid ties under rapid inserts
-        try:
-            timestamp = int(time.time_ns())
-        except AttributeError:
-            # Fallback for very old Python versions
-            timestamp = int(time.time() * 1_000_000_000)
-
-        logger.info(
-            f"Saving conversation to SQLModel SQLite DB: record {record_id} "
-            f"for session {session_id}, source {source} at {timestamp}"
+        record_ids = await self.save_conversations(
+            [
+                NewConversation(
+                    session_id=session_id,
+                    source=source,
+                    input_data=input_data,
+                    output=output,
+                    task_metadata=task_metadata,
+                )
+            ]
         )
+        return record_ids[0]
 
-        # Check if this is a new session before saving
-        is_new_session = self._is_new_session(session_id)
-
-        # Calculate token count for input + output
-        token_count = await calculate_tokens_in_record(input_data, output)
-
-        # Create new record
-        record = ConversationRecord(
-            id=record_id,
-            session_id=session_id,
-            source=source,
-            input=input_data,
-            output=output,
-            tokens=token_count,
-            timestamp=timestamp,
+    async def save_conversations(self, records: list[NewConversation]) -> list[str]:
+        """Save conversation records and trim their sessions in one transaction."""
+        if not records:
+            return []
+
+        # Check which sessions are new before saving
+        session_ids = list(dict.fromkeys(r["session_id"] for r in records))
+        new_session_ids = await self._run_blocking(
+            lambda: [s for s in session_ids if self._is_new_session(s)]
         )
 
-        with Session(self.engine) as session:
-            session.add(record)
-            session.commit()
+        rows: list[ConversationRecord] = []
+        for new_record in records:
+            # Nanosecond precision to avoid ties under rapid inserts
+            timestamp = time.time_ns()
+            record_id = _new_record_id(timestamp)
+
+            logger.debug(
+                "Saving conversation to SQLModel SQLite DB: record %s "
+                "for session %s, source %s at %s",
+                record_id,
+                new_record["session_id"],
+                new_record["source"],
+                timestamp,
+            )
 
-        logger.info("Successfully inserted record into conversation_history table")
+            # Calculate token count for input + output
+            token_count = await calculate_tokens_in_record(
+                new_record["input_data"], new_record["output"]
+            )
 
-        # Session LRU cleanup: only run when a new session is created
-        if is_new_session:
-            logger.info(f"🆕 New session detected: {session_id}, running LRU cleanup")
-            self._cleanup_excess_sessions()
+            rows.append(
+                ConversationRecord(
+                    id=record_id,
+                    session_id=new_record["session_id"],
+                    source=new_record["source"],
+                    input=new_record["input_data"],
+                    output=new_record["output"],
+                    tokens=token_count,
+                    timestamp=timestamp,
+                    task_metadata=new_record.get("task_metadata"),
+                )
+            )
 
-        # Per-session FIFO cleanup: maintain max records per session and model-specific token limits
-        # (runs on every save)
-        await self._cleanup_old_messages(session_id)
+        # IDs must be read before commit expires the instances
+        record_ids = [cast(str, row.id) for row in rows]
 
-        return record_id
+        def insert_and_trim() -> None:
+            with Session(self.engine) as session:
+                session.add_all(rows)
+                session.flush()
+                # Per-session FIFO cleanup: maintain max records per session and
+                # model-specific token limits (runs once per affected session on
+                # every save, committed together with the insert)
+                for session_id in session_ids:
+                    self._cleanup_old_messages(session, session_id)
+                session.commit()
+
+        try:
+            # One commit, and so one fsync for file-based databases, per save
+            await self._run_blocking(insert_and_trim)
+
+            logger.debug(
+                "Successfully inserted %d record(s) into conversation_history table",
+                len(rows),
+            )
+
+            # Session LRU cleanup: only run when a new session is created
+            if new_session_ids:
+                logger.info(
+                    f"🆕 New session(s) detected: {', '.join(new_session_ids)}, "
+                    "running LRU cleanup"
+                )
+                await self._run_blocking(self._cleanup_excess_sessions)
+        finally:
+            # Also covers the cleanup deletes, including other sessions' records
+            self.write_generation += 1
+
+        return record_ids
 
     async def get_session_conversations(
-        self, session_id: str, limit: int | None = None
+        self,
+        session_id: str,
+        limit: int | None = None,
+        before_id: str | None = None,
     ) -> list[ConversationRecord]:
         """Retrieve all conversation records for a session."""
-        with Session(self.engine) as session:
-            stmt = (
-                select(ConversationRecord)
-                .where(ConversationRecord.session_id == session_id)
-                .order_by(
-                    desc(ConversationRecord.timestamp),
-                    desc(ConversationRecord.id),
+        stmt = (
+            select(ConversationRecord)
+            .where(ConversationRecord.session_id == session_id)
+            .order_by(
+                desc(ConversationRecord.timestamp),
+                desc(ConversationRecord.id),
+            )
+        )
+
+        if before_id is not None:
+            # Keyset pagination on the (timestamp, id) sort key, so pages
+            # stay stable and no rows are skipped with OFFSET
+            cursor_timestamp = (
+                select(ConversationRecord.timestamp)
+                .where(ConversationRecord.id == before_id)
+                .scalar_subquery()
+            )
+            stmt = stmt.where(
+                or_(
+                    col(ConversationRecord.timestamp) < cursor_timestamp,
+                    and_(
+                        col(ConversationRecord.timestamp) == cursor_timestamp,
+                        col(ConversationRecord.id) < before_id,
+                    ),
+                )
+            )
+
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        def fetch() -> list[ConversationRecord]:
+            with Session(self.engine) as session:
+                return list(session.exec(stmt).all())
+
+        return await self._run_blocking(fetch)
+
+    async def get_session_conversations_within_budget(
+        self, session_id: str, token_budget: int, limit: int | None = None
+    ) -> list[ConversationRecord]:
+        """Retrieve the most recent records whose combined tokens fit the budget."""
+        # Running token total from the newest record backwards, computed by
+        # SQLite so only the records that fit are loaded
+        ranked = self._rank_session_records(session_id)
+        stmt = (
+            select(ConversationRecord)
+            .join(ranked, col(ConversationRecord.id) == ranked.c.id)
+            .where(
+                or_(
+                    ranked.c.running_tokens <= token_budget,
+                    ranked.c.position == 1,
                 )
             )
+            .order_by(
+                desc(ConversationRecord.timestamp),
+                desc(ConversationRecord.id),
+            )
+        )
 
-            if limit is not None:
-                stmt = stmt.limit(limit)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        def fetch() -> list[ConversationRecord]:
+            with Session(self.engine) as session:
+                return list(session.exec(stmt).all())
 
-            records = session.exec(stmt).all()
-            return list(records)
+        return await self._run_blocking(fetch)
+
+    async def get_task_metadata_snapshots(
+        self, session_id: str, limit: int | None = None
+    ) -> list[str]:
+        """Retrieve task metadata JSON for a session, most recent first."""
+        stmt = (
+            select(ConversationRecord.task_metadata)
+            .where(ConversationRecord.session_id == session_id)
+            .where(ConversationRecord.task_metadata.is_not(None))  # type: ignore[union-attr]
+            .order_by(
+                desc(ConversationRecord.timestamp),
+                desc(ConversationRecord.id),
+            )
+        )
+
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        def fetch() -> list[str]:
+            with Session(self.engine) as session:
+                return [row for row in session.exec(stmt).all() if row is not None]
+
+        return await self._run_blocking(fetch)
 
     async def get_recent_sessions(self, limit: int = 10) -> list[tuple[str, int]]:
         """Retrieve most recently active sessions with last activity timestamp."""
-        with Session(self.engine) as session:
-            stmt = (
-                select(
-                    ConversationRecord.session_id,
-                    func.max(ConversationRecord.timestamp).label("last_activity"),
-                )
-                .group_by(ConversationRecord.session_id)
-                .order_by(func.max(ConversationRecord.timestamp).desc())
-                .limit(limit)
+        stmt = (
+            select(
+                ConversationRecord.session_id,
+                func.max(ConversationRecord.timestamp).label("last_activity"),
             )
-            results = session.exec(stmt).all()
-            # results are tuples (session_id, last_activity)
-            return [(row[0], int(row[1])) for row in results]
+            .group_by(ConversationRecord.session_id)
+            .order_by(func.max(ConversationRecord.timestamp).desc())
+            .limit(limit)
+        )
+
+        def fetch() -> list[tuple[str, int]]:
+            with Session(self.engine) as session:
+                results = session.exec(stmt).all()
+                # results are tuples (session_id, last_activity)
+                return [(row[0], int(row[1])) for row in results]
+
+        return await self._run_blocking(fetch)
 
     async def delete_previous_plan(self, session_id: str) -> None:
         """
         Delete all previous judge_coding_plan records except the most recent one.
 
-        Uses SQL ORM to find all judge_coding_plan records for the session,
-        keeps only the most recent one, and deletes the rest.
+        Uses a single DELETE whose subquery selects every judge_coding_plan
+        record of the session except the most recent one.
         """
-        try:
-            with Session(self.engine) as session:
-                # Find all judge_coding_plan records for this session, ordered by timestamp DESC
-                stmt = (
-                    select(ConversationRecord)
-                    .where(ConversationRecord.session_id == session_id)
-                    .where(ConversationRecord.source == "judge_coding_plan")
-                    .order_by(
-                        desc(ConversationRecord.timestamp),
-                        desc(ConversationRecord.id),
-                    )
-                )
-                plan_records = list(session.exec(stmt).all())
-
-                if len(plan_records) <= 1:
-                    # No previous plans to delete
-                    logger.info(
-                        f"No previous judge_coding_plan records to delete for session {session_id}"
-                    )
-                    return
-
-                # Keep the first record (most recent), delete the rest
-                records_to_delete = plan_records[1:]  # Skip the first (most recent)
-                record_ids_to_delete: list[str] = [
-                    record.id for record in records_to_delete if record.id is not None
-                ]
+        # All judge_coding_plan records of the session, newest first,
+        # skipping the first (most recent) one
+        previous_plan_ids = (
+            select(ConversationRecord.id)
+            .where(ConversationRecord.session_id == session_id)
+            .where(ConversationRecord.source == "judge_coding_plan")
+            .order_by(
+                desc(ConversationRecord.timestamp),
+                desc(ConversationRecord.id),
+            )
+            .offset(1)
+        )
+        delete_stmt = delete(ConversationRecord).where(
+            col(ConversationRecord.id).in_(previous_plan_ids)
+        )
 
-                if not record_ids_to_delete:
-                    logger.info(
-                        f"No valid record IDs to delete for session {session_id}"
-                    )
-                    return
-
-                # Delete records using SQL IN clause with underlying SQLAlchemy session
-                # Use the table name from ConversationRecord to avoid type issues
-                table_name = ConversationRecord.__tablename__
-                table = SQLModel.metadata.tables[table_name]
-                delete_stmt = delete(table).where(table.c.id.in_(record_ids_to_delete))
-                # Use the underlying SQLAlchemy session for delete operations
-                session.execute(delete_stmt)
+        def delete_rows() -> int:
+            with Session(self.engine) as session:
+                result = cast(CursorResult[Any], session.execute(delete_stmt))
                 session.commit()
+                return result.rowcount
+
+        try:
+            deleted_count = await self._run_blocking(delete_rows)
 
+            if not deleted_count:
+                # No previous plans to delete
                 logger.info(
-                    f"Successfully deleted {len(records_to_delete)} previous judge_coding_plan records for session {session_id}"
+                    f"No previous judge_coding_plan records to delete for session {session_id}"
                 )
+                return
+
+            logger.info(
+                f"Successfully deleted {deleted_count} previous judge_coding_plan records for session {session_id}"
+            )
 
         except Exception as e:
             logger.error(
                 f"Error deleting previous judge_coding_plan records for session {session_id}: {e}"
             )
+        finally:
+            self.write_generation += 1
+
+    def close(self) -> None:
+        """Dispose of the engine's connection pool."""
+        self.engine.dispose()
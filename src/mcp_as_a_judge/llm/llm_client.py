@@ -219,7 +219,7 @@ class LLMClient:
                     content = choice.message.content
 
                     # Handle empty responses
-                    if not content or len(content.strip()) == 0:
+                    if not content or content.isspace():
                         raise ValueError("Empty response from LLM")
 
                     return str(content)
@@ -386,9 +386,10 @@ class TaskMetadata(BaseModel):
         if file_path not in self.accumulated_diff:
             self.accumulated_diff[file_path] = []
 
-        change_entry = {**change_data, "timestamp": int(time.time())}
+        now = int(time.time())
+        change_entry = {**change_data, "timestamp": now}
         self.accumulated_diff[file_path].append(change_entry)
-        self.updated_at = int(time.time())
+        self.updated_at = now
 
     # (Decision helpers intentionally omitted to keep HITL logic LLM-driven)
 
@@ -449,20 +450,23 @@ class TaskMetadata(BaseModel):
     # APPROVAL TRACKING METHODS
     def mark_plan_approved(self) -> None:
         """Mark the plan as approved by judge_coding_plan."""
-        self.plan_approved_at = int(time.time())
-        self.updated_at = int(time.time())
+        now = int(time.time())
+        self.plan_approved_at = now
+        self.updated_at = now
         self._update_approval_validation()
 
     def mark_code_approved(self, file_path: str) -> None:
         """Mark a specific file's code as approved by judge_code_change."""
-        self.code_approved_files[file_path] = int(time.time())
-        self.updated_at = int(time.time())
+        now = int(time.time())
+        self.code_approved_files[file_path] = now
+        self.updated_at = now
         self._update_approval_validation()
 
     def mark_testing_approved(self) -> None:
         """Mark the testing as approved by judge_testing_implementation."""
-        self.testing_approved_at = int(time.time())
-        self.updated_at = int(time.time())
+        now = int(time.time())
+        self.testing_approved_at = now
+        self.updated_at = now
         self._update_approval_validation()
 
     def get_approval_status(self) -> dict[str, Any]:
@@ -1,5 +1,7 @@
 """Prompt loader utility for loading and rendering Jinja2 templates."""
 
+import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, cast
 
@@ -9,11 +11,18 @@ except ImportError:
     # Python < 3.9 fallback
     from importlib_resources import files  # type: ignore[import-not-found,no-redef]
 
-from jinja2 import Environment, FileSystemLoader, Template
+from jinja2 import Environment, FileSystemLoader, Template, Undefined
 from mcp.types import SamplingMessage, TextContent
 from pydantic import BaseModel
 
 
+def _compact_json(value: Any) -> str:
+    """Jinja filter rendering a value as JSON without insignificant whitespace."""
+    if isinstance(value, Undefined):
+        return ""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
 class PromptLoader:
     """Loads and renders prompt templates using Jinja2."""
 
@@ -36,6 +45,12 @@ class PromptLoader:
             lstrip_blocks=True,
             autoescape=False,  # nosec B701 - Safe for prompt templates (not HTML)  # noqa: S701
         )
+        # Compact JSON for structured data embedded in prompts (fewer tokens
+        # than Python reprs or indented JSON)
+        self.env.filters["compact_json"] = _compact_json
+        # Compiled templates by name; prompts ship with the package and do not
+        # change at runtime, so skip Jinja's per-call loader lookup
+        self._templates: dict[str, Template] = {}
 
     def load_template(self, template_name: str) -> Template:
         """Load a Jinja2 template by name.
@@ -49,13 +64,20 @@ class PromptLoader:
         Raises:
             FileNotFoundError: If template file doesn't exist
         """
+        template = self._templates.get(template_name)
+        if template is not None:
+            return template
+
         try:
-            return self.env.get_template(template_name)
+            template = self.env.get_template(template_name)
         except Exception as e:
             raise FileNotFoundError(
                 f"Template '{template_name}' not found in {self.prompts_dir}"
             ) from e
 
+        self._templates[template_name] = template
+        return template
+
     def render_prompt(self, template_name: str, **kwargs: Any) -> str:
         """Load and render a prompt template with the given variables.
 
@@ -77,6 +99,18 @@ class PromptLoader:
 prompt_loader = PromptLoader()
 
 
+@lru_cache(maxsize=64)
+def _render_system_prompt(
+    template_name: str, variables: tuple[tuple[str, str | int | float], ...]
+) -> str:
+    """Render a system prompt once per distinct set of scalar variables.
+
+    System variables are schema strings and limits that rarely change, so the
+    rendered text is reused across tool calls.
+    """
+    return prompt_loader.render_prompt(template_name, **dict(variables))
+
+
 def create_separate_messages(
     system_template: str,
     user_template: str,
@@ -98,10 +132,15 @@ def create_separate_messages(
     Returns:
         List of SamplingMessage objects with separate system and user messages
     """
-    # Render system prompt with system variables
-    system_content = prompt_loader.render_prompt(
-        system_template, **system_vars.model_dump(exclude_none=True)
-    )
+    # Render system prompt with system variables, reusing the cached render
+    # when every variable is a hashable scalar
+    system_kwargs = system_vars.model_dump(exclude_none=True)
+    if all(isinstance(v, str | int | float) for v in system_kwargs.values()):
+        system_content = _render_system_prompt(
+            system_template, tuple(system_kwargs.items())
+        )
+    else:
+        system_content = prompt_loader.render_prompt(system_template, **system_kwargs)
 
     # Render user prompt with user variables
     user_content = prompt_loader.render_prompt(
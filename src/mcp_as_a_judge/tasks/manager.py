@@ -7,6 +7,9 @@ including creation, updates, state transitions, and persistence.
 
 import json
 import time
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
 
 from pydantic import ValidationError
 
@@ -17,6 +20,114 @@ from mcp_as_a_judge.models.task_metadata import TaskMetadata, TaskSize, TaskStat
 # Set up logger using custom get_logger function
 logger = get_logger(__name__)
 
+# Valid state transitions, built once at import. Targets are tuples in
+# definition order so error messages list them in that order.
+_VALID_TRANSITIONS: dict[TaskState, tuple[TaskState, ...]] = {
+    TaskState.CREATED: (TaskState.PLANNING, TaskState.BLOCKED, TaskState.CANCELLED),
+    TaskState.PLANNING: (
+        TaskState.PLAN_APPROVED,
+        TaskState.CREATED,
+        TaskState.BLOCKED,
+        TaskState.CANCELLED,
+    ),
+    TaskState.PLAN_APPROVED: (
+        TaskState.IMPLEMENTING,
+        TaskState.PLANNING,
+        TaskState.BLOCKED,
+        TaskState.CANCELLED,
+    ),
+    TaskState.IMPLEMENTING: (
+        TaskState.IMPLEMENTING,
+        TaskState.REVIEW_READY,
+        TaskState.PLAN_APPROVED,
+        TaskState.BLOCKED,
+        TaskState.CANCELLED,
+    ),
+    TaskState.REVIEW_READY: (
+        TaskState.COMPLETED,
+        TaskState.IMPLEMENTING,
+        TaskState.BLOCKED,
+        TaskState.CANCELLED,
+    ),
+    # Only allow cancellation of completed tasks
+    TaskState.COMPLETED: (TaskState.CANCELLED,),
+    TaskState.BLOCKED: (
+        TaskState.CREATED,
+        TaskState.PLANNING,
+        TaskState.PLAN_APPROVED,
+        TaskState.IMPLEMENTING,
+        TaskState.REVIEW_READY,
+        TaskState.CANCELLED,
+    ),
+    TaskState.CANCELLED: (),  # No transitions from cancelled state
+}
+
+# Rendered list of valid targets per state, used in transition error messages
+_VALID_TRANSITION_NAMES: dict[TaskState, str] = {
+    state: str([target.value for target in targets])
+    for state, targets in _VALID_TRANSITIONS.items()
+}
+
+# In-process cache of loaded task metadata, one LRU per conversation service
+# keyed by task_id. Entries store (expires_at, provider write generation,
+# metadata) and are only served until the service's provider is written to,
+# which also covers writes through other services sharing the provider.
+_TASK_CACHE_TTL_SECONDS = 60.0
+_TASK_CACHE_MAX_SIZE = 128
+# Fixed-shape tool output recorded by save_task_metadata_to_history
+_TASK_METADATA_OUTPUT_TEMPLATE = (
+    '{{"action": {action}, "current_task_metadata": {metadata}, '
+    '"timestamp": {timestamp}}}'
+)
+
+_task_caches: weakref.WeakKeyDictionary[
+    ConversationHistoryService, OrderedDict[str, tuple[float, int, TaskMetadata]]
+] = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=16)
+def _json_action(action: str) -> str:
+    """JSON-escape a save action; the set of actions is small and fixed."""
+    return json.dumps(action)
+
+
+def _get_cached_task_metadata(
+    task_id: str, conversation_service: ConversationHistoryService
+) -> TaskMetadata | None:
+    """Return a copy of the cached metadata for task_id if still current."""
+    task_cache = _task_caches.get(conversation_service)
+    if task_cache is None:
+        return None
+    entry = task_cache.get(task_id)
+    if entry is None:
+        return None
+    expires_at, write_generation, task_metadata = entry
+    if (
+        time.monotonic() >= expires_at
+        or conversation_service.db.write_generation != write_generation
+    ):
+        del task_cache[task_id]
+        return None
+    task_cache.move_to_end(task_id)
+    # Callers mutate the returned metadata, so never hand out the cached one
+    return task_metadata.model_copy(deep=True)
+
+
+def _cache_task_metadata(
+    task_metadata: TaskMetadata, conversation_service: ConversationHistoryService
+) -> None:
+    """Store a copy of task_metadata at the provider's current write generation."""
+    task_cache = _task_caches.setdefault(conversation_service, OrderedDict())
+    task_id = task_metadata.task_id
+    task_cache[task_id] = (
+        time.monotonic() + _TASK_CACHE_TTL_SECONDS,
+        conversation_service.db.write_generation,
+        task_metadata.model_copy(deep=True),
+    )
+    task_cache.move_to_end(task_id)
+    if len(task_cache) > _TASK_CACHE_MAX_SIZE:
+        task_cache.popitem(last=False)
+
 
 async def create_new_coding_task(
     user_request: str,
@@ -43,7 +154,7 @@ async def create_new_coding_task(
         New TaskMetadata instance
     """
 
-    logger.info(f"Creating new coding task: {task_title}")
+    logger.info("Creating new coding task: %s", task_title)
 
     # Create new TaskMetadata with auto-generated UUID
     task_metadata = TaskMetadata(
@@ -59,7 +170,7 @@ async def create_new_coding_task(
     if user_requirements:
         task_metadata.update_requirements(user_requirements, source="initial")
 
-    logger.info(f"Created new task metadata: {task_metadata.task_id}")
+    logger.info("Created new task metadata: %s", task_metadata.task_id)
     return task_metadata
 
 
@@ -92,7 +203,7 @@ async def update_existing_coding_task(
     Raises:
         ValueError: If task not found or invalid state transition
     """
-    logger.info(f"Updating existing coding task: {task_id}")
+    logger.info("Updating existing coding task: %s", task_id)
 
     # Load existing task metadata from conversation history
     existing_metadata = await load_task_metadata_from_history(
@@ -118,7 +229,7 @@ async def update_existing_coding_task(
         validate_state_transition(existing_metadata.state, state)
         existing_metadata.update_state(state)
 
-    logger.info(f"Updated task metadata: {task_id}")
+    logger.info("Updated task metadata: %s", task_id)
     return existing_metadata
 
 
@@ -137,11 +248,33 @@ async def load_task_metadata_from_history(
         TaskMetadata if found, None otherwise
     """
     try:
-        # Use task_id as primary key for conversation history
-        conversation_history = (
-            await conversation_service.load_filtered_context_for_enrichment(
-                session_id=task_id
-            )
+        cached = _get_cached_task_metadata(task_id, conversation_service)
+        if cached is not None:
+            return cached
+
+        # Use task_id as primary key for conversation history. Only records
+        # that carry a metadata snapshot are fetched, via the dedicated column.
+        # The newest snapshot normally carries an explicit state, so fetch just
+        # that row first and only scan older snapshots when it does not.
+        metadata_snapshots = await conversation_service.get_task_metadata_snapshots(
+            session_id=task_id, limit=1
+        )
+        if not metadata_snapshots:
+            return None
+
+        # Validate straight from JSON; pydantic-core parses without building an
+        # intermediate dict. Only accept it if the snapshot set state explicitly.
+        try:
+            task_metadata = TaskMetadata.model_validate_json(metadata_snapshots[0])
+        except ValidationError:
+            pass
+        else:
+            if "state" in task_metadata.model_fields_set:
+                _cache_task_metadata(task_metadata, conversation_service)
+                return task_metadata
+
+        metadata_snapshots = await conversation_service.get_task_metadata_snapshots(
+            session_id=task_id
         )
 
         # Strategy: prefer the most recent record that explicitly includes a state.
@@ -153,26 +286,27 @@ async def load_task_metadata_from_history(
         # state from the most recent earlier snapshot that has it.
 
         latest_snapshot: dict | None = None
+        snapshots: list[dict] = []
 
-        # IMPORTANT: conversation_history is returned in reverse chronological order
+        # IMPORTANT: snapshots are returned in reverse chronological order
         # (newest first). Iterate in that order so we always prefer the latest state.
         # Pass 1: newest → oldest, return first snapshot with explicit state
-        for record in conversation_history:
-            try:
-                output_data = json.loads(record.output)
-            except json.JSONDecodeError:
-                continue
-
-            if not isinstance(output_data, dict):
+        for snapshot_json in metadata_snapshots:
+            # Past the newest snapshot only ones carrying a state are used, so
+            # skip parsing snapshots that cannot contain the key at all
+            if latest_snapshot is not None and '"state"' not in snapshot_json:
                 continue
 
-            if "current_task_metadata" not in output_data:
+            try:
+                metadata_dict = json.loads(snapshot_json)
+            except json.JSONDecodeError:
                 continue
 
-            metadata_dict = output_data["current_task_metadata"]
             if not isinstance(metadata_dict, dict):
                 continue
 
+            snapshots.append(metadata_dict)
+
             # Keep the newest snapshot as a fallback for pass 2 (first iteration)
             if latest_snapshot is None:
                 latest_snapshot = dict(metadata_dict)
@@ -180,31 +314,17 @@ async def load_task_metadata_from_history(
             # Prefer snapshots that explicitly carry state
             if metadata_dict.get("state"):
                 try:
-                    return TaskMetadata.model_validate(metadata_dict)
+                    task_metadata = TaskMetadata.model_validate(metadata_dict)
                 except ValidationError:
                     # If this specific snapshot fails validation, keep searching
                     continue
+                _cache_task_metadata(task_metadata, conversation_service)
+                return task_metadata
 
         # Pass 2: if newest snapshot lacks state, try to backfill from older records
         if latest_snapshot is not None and "state" not in latest_snapshot:
-            for record in conversation_history:
-                try:
-                    output_data = json.loads(record.output)
-                except json.JSONDecodeError:
-                    continue
-
-                if not isinstance(output_data, dict):
-                    continue
-
-                if "current_task_metadata" not in output_data:
-                    continue
-
-                older_md = output_data["current_task_metadata"]
-                if (
-                    isinstance(older_md, dict)
-                    and "state" in older_md
-                    and older_md["state"]
-                ):
+            for older_md in snapshots:
+                if older_md.get("state"):
                     # Backfill only the missing state to avoid unintended resets
                     latest_snapshot["state"] = older_md["state"]
                     break
@@ -232,15 +352,18 @@ async def load_task_metadata_from_history(
                     pass
 
             try:
-                return TaskMetadata.model_validate(latest_snapshot)
+                task_metadata = TaskMetadata.model_validate(latest_snapshot)
             except ValidationError:
                 # Fall through to None if even the merged snapshot is invalid
                 pass
+            else:
+                _cache_task_metadata(task_metadata, conversation_service)
+                return task_metadata
 
         return None
 
     except Exception as e:
-        logger.warning(f"Failed to load task metadata from history: {e}")
+        logger.warning("Failed to load task metadata from history: %s", e)
         return None
 
 
@@ -265,24 +388,59 @@ async def save_task_metadata_to_history(
             session_id=task_metadata.task_id,
             tool_name="set_coding_task",
             tool_input=user_request,
-            tool_output=json.dumps(
-                {
-                    "action": action,
-                    "current_task_metadata": task_metadata.model_dump(mode="json"),
-                    "timestamp": int(time.time()),
-                }
+            # Embed pydantic's native JSON instead of dumping to a dict first
+            tool_output=_TASK_METADATA_OUTPUT_TEMPLATE.format(
+                action=_json_action(action),
+                metadata=task_metadata.model_dump_json(),
+                timestamp=int(time.time()),
             ),
         )
+        # Write through so the next load for this task skips the history
+        _cache_task_metadata(task_metadata, conversation_service)
 
         logger.info(
-            f"Saved task metadata to conversation history: {task_metadata.task_id}"
+            "Saved task metadata to conversation history: %s", task_metadata.task_id
         )
 
     except Exception as e:
-        logger.error(f"Failed to save task metadata to history: {e}")
+        logger.error("Failed to save task metadata to history: %s", e)
         # Don't raise - this is not critical for tool operation
 
 
+def schedule_task_metadata_save(
+    task_metadata: TaskMetadata,
+    user_request: str,
+    action: str,
+    conversation_service: ConversationHistoryService,
+) -> None:
+    """
+    Save TaskMetadata to conversation history without waiting for the write.
+
+    The metadata is snapshotted and cached immediately, so later loads see it
+    even before the background write lands. The write is tracked by the
+    conversation service, so its reads and wait_for_pending_saves() wait for
+    it.
+
+    Args:
+        task_metadata: Task metadata to save
+        user_request: Original user request
+        action: Action taken ("created" or "updated")
+        conversation_service: Conversation service
+    """
+    # Callers keep mutating their metadata after scheduling the save
+    snapshot = task_metadata.model_copy(deep=True)
+    _cache_task_metadata(snapshot, conversation_service)
+
+    conversation_service.schedule_background_save(
+        save_task_metadata_to_history(
+            task_metadata=snapshot,
+            user_request=user_request,
+            action=action,
+            conversation_service=conversation_service,
+        )
+    )
+
+
 def validate_state_transition(current_state: TaskState, new_state: TaskState) -> None:
     """
     Validate that the state transition is allowed.
@@ -294,50 +452,8 @@ def validate_state_transition(current_state: TaskState, new_state: TaskState) ->
     Raises:
         ValueError: If transition is not allowed
     """
-    # Define valid state transitions
-    valid_transitions = {
-        TaskState.CREATED: [TaskState.PLANNING, TaskState.BLOCKED, TaskState.CANCELLED],
-        TaskState.PLANNING: [
-            TaskState.PLAN_APPROVED,
-            TaskState.CREATED,
-            TaskState.BLOCKED,
-            TaskState.CANCELLED,
-        ],
-        TaskState.PLAN_APPROVED: [
-            TaskState.IMPLEMENTING,
-            TaskState.PLANNING,
-            TaskState.BLOCKED,
-            TaskState.CANCELLED,
-        ],
-        TaskState.IMPLEMENTING: [
-            TaskState.IMPLEMENTING,
-            TaskState.REVIEW_READY,
-            TaskState.PLAN_APPROVED,
-            TaskState.BLOCKED,
-            TaskState.CANCELLED,
-        ],
-        TaskState.REVIEW_READY: [
-            TaskState.COMPLETED,
-            TaskState.IMPLEMENTING,
-            TaskState.BLOCKED,
-            TaskState.CANCELLED,
-        ],
-        TaskState.COMPLETED: [
-            TaskState.CANCELLED
-        ],  # Only allow cancellation of completed tasks
-        TaskState.BLOCKED: [
-            TaskState.CREATED,
-            TaskState.PLANNING,
-            TaskState.PLAN_APPROVED,
-            TaskState.IMPLEMENTING,
-            TaskState.REVIEW_READY,
-            TaskState.CANCELLED,
-        ],
-        TaskState.CANCELLED: [],  # No transitions from cancelled state
-    }
-
-    if new_state not in valid_transitions.get(current_state, []):
+    if new_state not in _VALID_TRANSITIONS.get(current_state, ()):
         raise ValueError(
             f"Invalid state transition: {current_state.value} → {new_state.value}. "
-            f"Valid transitions from {current_state.value}: {[s.value for s in valid_transitions.get(current_state, [])]}"
+            f"Valid transitions from {current_state.value}: {_VALID_TRANSITION_NAMES.get(current_state, '[]')}"
         )
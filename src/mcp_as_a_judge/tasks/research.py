@@ -118,8 +118,9 @@ async def analyze_research_requirements(
         )
 
         # Parse and validate the response
-        json_content = extract_json_from_response(response_text)
-        analysis = ResearchRequirementsAnalysis.model_validate_json(json_content)
+        analysis = ResearchRequirementsAnalysis.model_validate_json(
+            extract_json_from_response(response_text)
+        )
 
         logger.info(
             f"Research analysis complete: Expected URLs={analysis.expected_url_count}, "
@@ -291,8 +292,9 @@ async def analyze_research_aspects(
         response_text = await llm_provider.send_message(
             messages=messages, ctx=ctx, max_tokens=MAX_TOKENS, prefer_sampling=True
         )
-        json_content = extract_json_from_response(response_text)
-        aspects = ResearchAspectsExtraction.model_validate_json(json_content)
+        aspects = ResearchAspectsExtraction.model_validate_json(
+            extract_json_from_response(response_text)
+        )
         return aspects
     except Exception as e:
         logger.warning(f"Failed to extract research aspects via LLM: {e}")
@@ -7,15 +7,20 @@ and current state.
 """
 
 import json
+import logging
+from collections import OrderedDict
 from copy import deepcopy
 from pathlib import Path
 from typing import Any
 
+from mcp.types import Tool
 from pydantic import BaseModel, Field
 
 from mcp_as_a_judge.core.constants import MAX_TOKENS
+from mcp_as_a_judge.core.json_extraction import extract_json_from_response
 from mcp_as_a_judge.core.logging_config import get_logger
 from mcp_as_a_judge.db.conversation_history_service import ConversationHistoryService
+from mcp_as_a_judge.db.interface import ConversationRecord
 from mcp_as_a_judge.messaging.llm_provider import llm_provider
 from mcp_as_a_judge.models.task_metadata import TaskMetadata, TaskSize, TaskState
 
@@ -112,6 +117,15 @@ class WorkflowGuidance(BaseModel):
         return self.guidance
 
 
+# Base response schema, computed once; calculate_next_stage deep-copies it
+_WORKFLOW_SCHEMA = WorkflowGuidance.model_json_schema()
+
+# LRU cache of formatted conversation context keyed by the formatted record
+# IDs; records are never modified after being saved
+_CONVERSATION_CONTEXT_CACHE_SIZE = 128
+_conversation_context_cache: OrderedDict[tuple[str | None, ...], str] = OrderedDict()
+
+
 class WorkflowGuidanceUserVars(BaseModel):
     """Variables for workflow guidance user prompt."""
 
@@ -256,11 +270,7 @@ async def calculate_next_stage(
                 session_id=task_metadata.task_id
             )
         )
-        conversation_context = _format_conversation_for_llm(
-            conversation_service.format_conversation_history_as_json_array(
-                recent_records
-            )
-        )
+        conversation_context = _format_conversation_for_llm(recent_records)
 
         # Research requirements are determined by LLM through prompts when needed
         # For now, we'll let the calling tools handle research requirement setting
@@ -270,8 +280,10 @@ async def calculate_next_stage(
         from mcp_as_a_judge.models import SystemVars
 
         # Get tool descriptions and state info for the prompt
-        tool_descriptions = await _get_tool_descriptions()
-        available_name_set = await _get_available_tool_names()
+        # List the registered tools once and derive both views from it
+        registered_tools = await _list_registered_tools()
+        tool_descriptions = _get_tool_descriptions(registered_tools)
+        available_name_set = _get_available_tool_names(registered_tools)
         available_tool_names = sorted(available_name_set)
         state_info = task_metadata.get_current_state_info()
 
@@ -367,8 +379,7 @@ async def calculate_next_stage(
         )
 
         # Build a dynamic response schema that constrains next_tool to allowed tools
-        base_schema = WorkflowGuidance.model_json_schema()
-        dynamic_schema = deepcopy(base_schema)
+        dynamic_schema = deepcopy(_WORKFLOW_SCHEMA)
         try:
             props = dynamic_schema.get("properties", {})
             if "next_tool" in props:
@@ -383,7 +394,7 @@ async def calculate_next_stage(
                 }
         except Exception:
             # Fall back silently to base schema if anything goes wrong
-            dynamic_schema = base_schema
+            dynamic_schema = _WORKFLOW_SCHEMA
 
         # Create system and user variables for the workflow guidance
         system_vars = SystemVars(
@@ -425,24 +436,14 @@ async def calculate_next_stage(
             prefer_sampling=True,  # Factory handles all message format decisions
         )
 
-        # Parse the JSON response using the existing DRY method
-        from mcp_as_a_judge.core.server_helpers import extract_json_from_response
-
-        try:
-            logger.info(f"Raw LLM response length: {len(response)}")
-            logger.info(f"Raw LLM response preview: {response[:300]}...")
-
-            json_content = extract_json_from_response(response)
-            logger.info(f"Extracted JSON content length: {len(json_content)}")
-            logger.info(f"Extracted JSON preview: {json_content[:200]}...")
-
-            navigation_data = json.loads(json_content)
-            logger.info(f"Parsed JSON keys: {list(navigation_data.keys())}")
+        # Parse errors fall through to the fallback handler below, which logs
+        # the failure and (at debug level) the raw response
+        logger.debug("Raw LLM response length: %d", len(response))
+        logger.debug("Raw LLM response preview: %.300s...", response)
 
-        except (ValueError, json.JSONDecodeError) as e:
-            logger.error(f"❌ Failed to parse LLM response: {e}")
-            logger.error(f"❌ Raw response: {response[:500]}...")
-            raise ValueError(f"Failed to parse workflow guidance response: {e}") from e
+        navigation_data = json.loads(extract_json_from_response(response))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsed JSON keys: %s", list(navigation_data.keys()))
 
         # Validate required fields
         required_fields = ["next_tool", "reasoning", "preparation_needed", "guidance"]
@@ -510,24 +511,19 @@ async def calculate_next_stage(
         )
 
         # Debug: Log the actual response if available
-        if "response" in locals():
-            logger.error(f"Full LLM response length: {len(response)}")
-            logger.error(f"Full LLM response: {response}")
+        if "response" in locals() and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Full LLM response length: %d", len(response))
+            logger.debug("Full LLM response: %s", response)
 
             # Check if response is truncated (doesn't end with proper JSON closing)
-            if not response.strip().endswith("}"):
-                logger.error("Response appears to be truncated - doesn't end with '}'")
+            if not response.rstrip().endswith("}"):
+                logger.debug("Response appears to be truncated - doesn't end with '}'")
 
             # Try to see if we can extract partial JSON
             try:
-                from mcp_as_a_judge.core.server_helpers import (
-                    extract_json_from_response,
-                )
-
-                json_content = extract_json_from_response(response)
-                logger.error(f"Extracted JSON: {json_content}")
+                logger.debug("Extracted JSON: %s", extract_json_from_response(response))
             except Exception as extract_error:
-                logger.error(f"JSON extraction also failed: {extract_error}")
+                logger.debug("JSON extraction also failed: %s", extract_error)
 
         # Return fallback navigation with appropriate next tool based on state
         fallback_next_tool: str | None = "judge_coding_plan"  # Default fallback
@@ -542,7 +538,8 @@ async def calculate_next_stage(
         elif task_metadata.state == TaskState.COMPLETED:
             fallback_next_tool = None  # Only case where null is appropriate
 
-        return WorkflowGuidance(
+        # Values are fixed strings built here, so skip validation on this path
+        return WorkflowGuidance.model_construct(
             next_tool=fallback_next_tool,
             reasoning="Error occurred during workflow calculation, providing fallback based on current state",
             preparation_needed=[
@@ -553,57 +550,79 @@ async def calculate_next_stage(
         )
 
 
-def _format_conversation_for_llm(conversation_history: list[dict[str, Any]]) -> str:
+def _format_conversation_for_llm(conversation_history: list[ConversationRecord]) -> str:
     """
     Format conversation history for LLM context.
 
     Args:
-        conversation_history: List of conversation records
+        conversation_history: List of conversation records, newest first
 
     Returns:
-        Formatted string for LLM prompt
+        Formatted string for LLM prompt, in chronological order
     """
     if not conversation_history:
         return "No previous conversation history."
 
-    formatted_lines = []
-    for record in conversation_history[-10:]:  # Last 10 records
-        ts = record.get("timestamp")
-        src = record.get("source")
-        inp = record.get("input")
-        out = record.get("output")
-        formatted_lines.append(f"[{ts}] {src}:\nInput: {inp}\nOutput: {out}\n")
+    # History arrives newest first; emit the 10 most recent records oldest
+    # first so new records only ever extend the end of the prompt text, which
+    # keeps the preceding prompt prefix stable for provider prompt caching
+    records = conversation_history[9::-1]
+    cache_key = tuple(record.id for record in records)
+    cached = _conversation_context_cache.get(cache_key)
+    if cached is not None:
+        _conversation_context_cache.move_to_end(cache_key)
+        return cached
+
+    formatted = "\n".join(
+        [
+            f"[{record.timestamp}] {record.source}:\n"
+            f"Input: {record.input}\nOutput: {record.output}\n"
+            for record in records
+        ]
+    )
+
+    if None in cache_key:
+        # Unsaved records have no identity to cache on
+        return formatted
 
-    return "\n".join(formatted_lines)
+    _conversation_context_cache[cache_key] = formatted
+    if len(_conversation_context_cache) > _CONVERSATION_CONTEXT_CACHE_SIZE:
+        _conversation_context_cache.popitem(last=False)
+    return formatted
 
 
-async def _get_tool_descriptions() -> str:
+async def _list_registered_tools() -> list[Tool] | None:
     """
-    Get formatted tool descriptions for prompt template.
-
-    Programmatically retrieves tool descriptions from the MCP server instance
-    to avoid hardcoding and ensure consistency with actual registered tools.
+    List the tools registered on the MCP server instance.
 
     Returns:
-        Formatted string with tool descriptions
+        The registered tools, or None if the server object is unavailable
     """
     try:
         # Import the global MCP server instance
-        from mcp_as_a_judge.server import mcp
+        from mcp_as_a_judge.server import mcp  # Local import to avoid cycles
 
         # Use the public FastMCP API to list tools
-        tools = await mcp.list_tools()
+        return await mcp.list_tools()
+    except Exception as e:
+        logger.warning(f"Failed to list registered tools: {e}")
+        return None
 
-        # Format as markdown list
-        formatted_descriptions: list[str] = []
-        for t in sorted(tools, key=lambda x: x.name):
-            description = t.description or f"Tool: {t.name}"
-            formatted_descriptions.append(f"- **{t.name}**: {description}")
 
-        return "\n".join(formatted_descriptions)
+def _get_tool_descriptions(tools: list[Tool] | None) -> str:
+    """
+    Get formatted tool descriptions for prompt template.
 
-    except Exception as e:
-        logger.warning(f"Failed to get tool descriptions programmatically: {e}")
+    Uses the tool descriptions registered on the MCP server instance to avoid
+    hardcoding and ensure consistency with actual registered tools.
+
+    Args:
+        tools: Registered tools from _list_registered_tools()
+
+    Returns:
+        Formatted string with tool descriptions
+    """
+    if tools is None:
         # Fallback to static descriptions
         return """
 - **set_coding_task**: Create or update task metadata (entry point for all coding work)
@@ -615,19 +634,21 @@ async def _get_tool_descriptions() -> str:
 - **raise_missing_requirements**: Handle unclear or incomplete requirements
 """
 
+    # Format as markdown list
+    formatted_descriptions: list[str] = []
+    for t in sorted(tools, key=lambda x: x.name):
+        description = t.description or f"Tool: {t.name}"
+        formatted_descriptions.append(f"- **{t.name}**: {description}")
 
-async def _get_available_tool_names() -> set[str]:
-    """Return the set of registered tool names using the FastMCP server API.
+    return "\n".join(formatted_descriptions)
 
-    Falls back to a static set if the server object is unavailable.
-    """
-    try:
-        from mcp_as_a_judge.server import mcp  # Local import to avoid cycles
 
-        # Use the public async API to list tools
-        tools = await mcp.list_tools()
-        return {t.name for t in tools}
-    except Exception:
+def _get_available_tool_names(tools: list[Tool] | None) -> set[str]:
+    """Return the set of registered tool names.
+
+    Falls back to a static set if the server tools could not be listed.
+    """
+    if tools is None:
         # Conservative fallback to known tools in this project
         return {
             "set_coding_task",
@@ -639,6 +660,7 @@ async def _get_available_tool_names() -> set[str]:
             "raise_obstacle",
             "raise_missing_requirements",
         }
+    return {t.name for t in tools}
 
 
 def _normalize_next_tool_name(
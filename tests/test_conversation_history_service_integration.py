@@ -5,10 +5,12 @@ Tests the service layer that sits between the server and database.
 """
 
 import asyncio
+import json
 from datetime import datetime
 
 import pytest
 
+from mcp_as_a_judge.core.constants import MAX_CONTEXT_TOKENS
 from mcp_as_a_judge.db.conversation_history_service import ConversationHistoryService
 from mcp_as_a_judge.db.db_config import load_config
 
@@ -258,6 +260,290 @@ class TestConversationHistoryServiceIntegration:
             f"✅ Performance test completed - limit enforced: {len(history)}/{expected_count}"
         )
 
+    @pytest.mark.asyncio
+    async def test_service_task_metadata_snapshots(self, service):
+        """Test that task metadata snapshots are stored and loaded via their column."""
+        from mcp_as_a_judge.tasks.manager import load_task_metadata_from_history
+
+        session_id = "metadata_snapshot_session"
+
+        await service.save_tool_interaction_and_cleanup(
+            session_id=session_id,
+            tool_name="set_coding_task",
+            tool_input="Create task",
+            tool_output=json.dumps(
+                {
+                    "action": "created",
+                    "current_task_metadata": {
+                        "task_id": session_id,
+                        "title": "Snapshot task",
+                        "description": "Task used to test snapshots",
+                        "task_size": "m",
+                        "state": "planning",
+                    },
+                }
+            ),
+        )
+        await service.save_tool_interaction_and_cleanup(
+            session_id=session_id,
+            tool_name="judge_coding_plan",
+            tool_input="Review plan",
+            tool_output="Plain text output without metadata",
+        )
+
+        snapshots = await service.get_task_metadata_snapshots(session_id)
+        assert len(snapshots) == 1
+        assert json.loads(snapshots[0])["state"] == "planning"
+
+        task_metadata = await load_task_metadata_from_history(session_id, service)
+        assert task_metadata is not None
+        assert task_metadata.task_id == session_id
+        assert task_metadata.state.value == "planning"
+
+        # A newer snapshot without an explicit state falls back to older ones
+        await service.save_tool_interaction_and_cleanup(
+            session_id=session_id,
+            tool_name="judge_coding_plan",
+            tool_input="Review plan again",
+            tool_output=json.dumps(
+                {
+                    "current_task_metadata": {
+                        "task_id": session_id,
+                        "title": "Renamed snapshot task",
+                        "description": "Task used to test snapshots",
+                        "task_size": "m",
+                    },
+                }
+            ),
+        )
+        assert len(await service.get_task_metadata_snapshots(session_id, limit=1)) == 1
+
+        task_metadata = await load_task_metadata_from_history(session_id, service)
+        assert task_metadata is not None
+        assert task_metadata.state.value == "planning"
+
+    @pytest.mark.asyncio
+    async def test_task_metadata_cache_tracks_saved_versions(self, service):
+        """Test that cached task metadata is reused until newer metadata is saved."""
+        from mcp_as_a_judge.models.task_metadata import (
+            TaskMetadata,
+            TaskSize,
+            TaskState,
+        )
+        from mcp_as_a_judge.tasks.manager import (
+            load_task_metadata_from_history,
+            save_task_metadata_to_history,
+        )
+
+        task = TaskMetadata(
+            title="Cached task",
+            description="Task used to test the metadata cache",
+            task_size=TaskSize.S,
+        )
+        await save_task_metadata_to_history(task, "Create task", "created", service)
+
+        # Served from the write-through cache without touching the history
+        original_snapshots = service.get_task_metadata_snapshots
+        service.get_task_metadata_snapshots = None
+        try:
+            cached = await load_task_metadata_from_history(task.task_id, service)
+        finally:
+            service.get_task_metadata_snapshots = original_snapshots
+        assert cached is not None
+        assert cached is not task
+        assert cached.state == TaskState.CREATED
+
+        # Mutating a loaded copy must not leak into the cache
+        cached.state = TaskState.CANCELLED
+        reloaded = await load_task_metadata_from_history(task.task_id, service)
+        assert reloaded.state == TaskState.CREATED
+
+        # Metadata saved directly by a tool output supersedes the cached entry
+        updated = task.model_dump(mode="json") | {"state": "planning"}
+        await service.save_tool_interaction_and_cleanup(
+            session_id=task.task_id,
+            tool_name="judge_coding_plan",
+            tool_input="Review plan",
+            tool_output=json.dumps({"current_task_metadata": updated}),
+        )
+        reloaded = await load_task_metadata_from_history(task.task_id, service)
+        assert reloaded.state == TaskState.PLANNING
+
+    @pytest.mark.asyncio
+    async def test_scheduled_task_metadata_save(self, service):
+        """Test that background metadata saves are visible before and after flushing."""
+        from mcp_as_a_judge.models.task_metadata import TaskMetadata, TaskSize
+        from mcp_as_a_judge.tasks.manager import (
+            load_task_metadata_from_history,
+            schedule_task_metadata_save,
+        )
+
+        task = TaskMetadata(
+            title="Background task",
+            description="Task saved in the background",
+            task_size=TaskSize.M,
+        )
+        schedule_task_metadata_save(task, "Create task", "created", service)
+        # Later mutations must not leak into the scheduled snapshot
+        task.title = "Mutated after scheduling"
+
+        loaded = await load_task_metadata_from_history(task.task_id, service)
+        assert loaded is not None
+        assert loaded.title == "Background task"
+
+        # Service reads wait for the manager's background save
+        snapshots = await service.get_task_metadata_snapshots(task.task_id)
+        assert len(snapshots) == 1
+        assert json.loads(snapshots[0])["title"] == "Background task"
+
+    @pytest.mark.asyncio
+    async def test_task_metadata_cache_sees_writes_from_shared_provider(self, service):
+        """Test that cached task metadata is dropped when another service writes."""
+        from mcp_as_a_judge.models.task_metadata import TaskMetadata, TaskSize
+        from mcp_as_a_judge.tasks.manager import (
+            load_task_metadata_from_history,
+            save_task_metadata_to_history,
+        )
+
+        other_service = ConversationHistoryService(service.config, service.db)
+        task = TaskMetadata(
+            title="Shared task",
+            description="Task saved through one of two services",
+            task_size=TaskSize.M,
+        )
+        await save_task_metadata_to_history(task, "Create task", "created", service)
+        cached = await load_task_metadata_from_history(task.task_id, service)
+        assert cached is not None
+        assert cached.title == "Shared task"
+
+        task.title = "Renamed through the other service"
+        await save_task_metadata_to_history(
+            task, "Update task", "updated", other_service
+        )
+
+        reloaded = await load_task_metadata_from_history(task.task_id, service)
+        assert reloaded is not None
+        assert reloaded.title == "Renamed through the other service"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_saves_are_written_in_one_batch(self, service):
+        """Test that saves issued together are group-committed in one transaction."""
+        session_id = "group_commit_session"
+        batch_sizes = []
+        original_save_conversations = service.db.save_conversations
+
+        async def counting_save_conversations(records):
+            batch_sizes.append(len(records))
+            return await original_save_conversations(records)
+
+        service.db.save_conversations = counting_save_conversations
+
+        record_ids = await asyncio.gather(
+            *(
+                service.save_tool_interaction_and_cleanup(
+                    session_id=session_id,
+                    tool_name="judge_code_change",
+                    tool_input=f"Review change {i}",
+                    tool_output=f"Change {i} approved",
+                )
+                for i in range(3)
+            )
+        )
+
+        assert batch_sizes == [3]
+        assert len(set(record_ids)) == 3
+        history = await service.load_filtered_context_for_enrichment(session_id)
+        assert [record.id for record in history] == list(reversed(record_ids))
+
+    @pytest.mark.asyncio
+    async def test_enrichment_context_cached_until_next_write(self, service):
+        """Test that repeated loads are served from cache until a write."""
+        session_id = "context_cache_session"
+        queries = []
+        original_query = service.db.get_session_conversations_within_budget
+
+        async def counting_query(*args, **kwargs):
+            queries.append(args)
+            return await original_query(*args, **kwargs)
+
+        service.db.get_session_conversations_within_budget = counting_query
+
+        await service.save_tool_interaction_and_cleanup(
+            session_id=session_id,
+            tool_name="judge_coding_plan",
+            tool_input="Plan",
+            tool_output="Plan approved",
+        )
+        first = await service.load_filtered_context_for_enrichment(session_id)
+        second = await service.load_filtered_context_for_enrichment(session_id)
+        assert len(queries) == 1
+        assert [r.id for r in second] == [r.id for r in first]
+
+        await service.save_tool_interaction_and_cleanup(
+            session_id=session_id,
+            tool_name="judge_code_change",
+            tool_input="Change",
+            tool_output="Change approved",
+        )
+        third = await service.load_filtered_context_for_enrichment(session_id)
+        assert len(queries) == 2
+        assert len(third) == 2
+
+    @pytest.mark.asyncio
+    async def test_scheduled_tool_interaction_save(self, service):
+        """Test that reads wait for tool interaction saves scheduled in the background."""
+        session_id = "background_save_session"
+
+        service.schedule_tool_interaction_save(
+            session_id=session_id,
+            tool_name="judge_code_change",
+            tool_input="Review change",
+            tool_output="Change approved",
+        )
+
+        history = await service.load_filtered_context_for_enrichment(session_id)
+        assert [record.source for record in history] == ["judge_code_change"]
+
+        service.schedule_tool_interaction_save(
+            session_id=session_id,
+            tool_name="judge_testing_implementation",
+            tool_input="Review tests",
+            tool_output="Tests approved",
+        )
+        await service.wait_for_pending_saves()
+        records = await service.db.get_session_conversations(session_id)
+        assert len(records) == 2
+
+    @pytest.mark.asyncio
+    async def test_recent_sessions_include_scheduled_saves(self, service):
+        """Test that recent sessions are read after background saves land."""
+        service.schedule_tool_interaction_save(
+            session_id="scheduled_recent_session",
+            tool_name="set_coding_task",
+            tool_input="Create task",
+            tool_output="Task created",
+        )
+
+        recent = await service.get_recent_sessions(limit=1)
+        assert [session_id for session_id, _ in recent] == ["scheduled_recent_session"]
+
+    @pytest.mark.asyncio
+    async def test_oversized_prompt_keeps_only_latest_record(self, service):
+        """Test that a prompt filling the context leaves only the latest record."""
+        session_id = "oversized_prompt_session"
+        for i in range(3):
+            await service.save_tool_interaction_and_cleanup(
+                session_id=session_id,
+                tool_name=f"tool_{i}",
+                tool_input="input",
+                tool_output="output",
+            )
+
+        history = await service.load_filtered_context_for_enrichment(
+            session_id, current_prompt="x" * (MAX_CONTEXT_TOKENS * 4 + 4)
+        )
+        assert [record.source for record in history] == ["tool_2"]
+
 
 if __name__ == "__main__":
     # Run tests directly for development
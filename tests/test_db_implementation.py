@@ -5,8 +5,14 @@ Simple test script to verify the SQLite-based in-memory database implementation.
 
 import asyncio
 
+import pytest
 from test_utils import DatabaseTestUtils
 
+from mcp_as_a_judge.db.db_config import Config, get_database_provider_from_url
+from mcp_as_a_judge.db.factory import (
+    close_shared_providers,
+    create_database_provider,
+)
 from mcp_as_a_judge.db.providers.sqlite_provider import SQLiteProvider
 
 
@@ -90,5 +96,45 @@ async def test_database_operations():
     print("\n✅ All tests completed successfully!")
 
 
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("", "in_memory"),
+        ("  ", "in_memory"),
+        ("sqlite://:memory:", "in_memory"),
+        (":MEMORY:", "in_memory"),
+        (" sqlite:///path/to/file.db", "sqlite"),
+        ("conversations.DB", "sqlite"),
+        ("POSTGRESQL://localhost/judge", "postgresql"),
+        ("postgres://localhost/judge", "postgresql"),
+        ("mysql+pymysql://localhost/judge", "mysql"),
+        ("redis://localhost", "in_memory"),
+    ],
+)
+def test_get_database_provider_from_url(url, expected):
+    """Test provider detection from database URLs."""
+    assert get_database_provider_from_url(url) == expected
+
+
+@pytest.fixture
+def shared_providers():
+    """Close providers shared by create_database_provider after the test."""
+    yield
+    close_shared_providers()
+
+
+def test_create_database_provider_shares_file_providers(tmp_path, shared_providers):
+    """File-backed providers are reused; in-memory providers are not."""
+    config = Config()
+    assert create_database_provider(config) is not create_database_provider(config)
+
+    config.database.url = str(tmp_path / "history.db")
+    provider = create_database_provider(config)
+    assert create_database_provider(config) is provider
+
+    close_shared_providers()
+    assert create_database_provider(config) is not provider
+
+
 if __name__ == "__main__":
     asyncio.run(test_database_operations())
@@ -5,6 +5,8 @@ This module tests the new user requirements alignment and
 elicitation functionality.
 """
 
+import asyncio
+
 import pytest
 
 from mcp_as_a_judge.models import JudgeResponse
@@ -107,6 +109,81 @@ def send_slack_message(channel, message):
         assert isinstance(result, JudgeResponse)
         assert len(result.feedback) > 0
 
+    @pytest.mark.asyncio
+    async def test_judge_code_change_error_keeps_task_metadata(
+        self, mock_context_with_sampling, monkeypatch
+    ):
+        """Test that an error after a failed metadata load still returns metadata."""
+        from mcp_as_a_judge import server
+
+        async def failing_history_load(*args, **kwargs):
+            raise RuntimeError("history unavailable")
+
+        monkeypatch.setattr(
+            server.conversation_service,
+            "load_filtered_context_for_enrichment",
+            failing_history_load,
+        )
+
+        result = await judge_code_change(
+            code_change="print('hello')",
+            file_path="hello.py",
+            task_id="missing-task-for-error-path",
+            ctx=mock_context_with_sampling,
+        )
+
+        assert result.approved is False
+        assert result.current_task_metadata is not None
+        assert result.current_task_metadata.title == "Error Task"
+
+    @pytest.mark.asyncio
+    async def test_rejected_plan_cancels_research_validation(
+        self, mock_context_with_sampling, monkeypatch
+    ):
+        """Test that a rejected plan cancels the in-flight research validation."""
+        from mcp_as_a_judge import server
+
+        session = mock_context_with_sampling.session
+        answer_other = session.create_message
+        research_started = asyncio.Event()
+        research_calls: list[str] = []
+
+        async def create_message(**kwargs):
+            if "Research Quality Validation" not in str(kwargs):
+                return await answer_other(**kwargs)
+            research_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                research_calls.append("cancelled")
+                raise
+            research_calls.append("completed")
+
+        async def reject_plan(*args, **kwargs):
+            await research_started.wait()
+            return JudgeResponse(
+                approved=False,
+                required_improvements=["Add error handling"],
+                feedback="Plan rejected",
+                current_task_metadata=args[7],  # task_metadata
+            )
+
+        session.create_message = create_message
+        monkeypatch.setattr(server, "_evaluate_coding_plan", reject_plan)
+
+        result = await judge_coding_plan(
+            plan="Create Slack MCP server with message sending",
+            design="Use slack-sdk library with FastMCP framework",
+            research="Analyzed slack-sdk docs and MCP patterns",
+            research_urls=["https://slack.dev/python-slack-sdk/"],
+            user_requirements="Send CI/CD status updates to Slack channels",
+            ctx=mock_context_with_sampling,
+        )
+        await asyncio.sleep(0)
+
+        assert result.approved is False
+        assert research_calls == ["cancelled"]
+
 
 class TestObstacleResolution:
     """Test the raise_obstacle tool."""
@@ -228,6 +305,35 @@ class TestWorkflowGuidance:
         assert len(guidance.reasoning) > 0
         assert isinstance(guidance.guidance, str)
 
+    def test_conversation_context_includes_ten_newest_records(self):
+        """Test that the LLM sees the 10 newest records, oldest first."""
+        from mcp_as_a_judge.db.interface import ConversationRecord
+        from mcp_as_a_judge.workflow.workflow_guidance import (
+            _format_conversation_for_llm,
+        )
+
+        # Newest first, as loaded from the history
+        history = [
+            ConversationRecord(
+                id=f"record_{i}",
+                session_id="context_order_session",
+                source=f"tool_{i}",
+                input="input",
+                output="output",
+                timestamp=i,
+            )
+            for i in range(15, 0, -1)
+        ]
+
+        formatted = _format_conversation_for_llm(history)
+
+        sources = [
+            line.split("] ", 1)[1].rstrip(":")
+            for line in formatted.splitlines()
+            if line.startswith("[")
+        ]
+        assert sources == [f"tool_{i}" for i in range(6, 16)]
+
 
 class TestIntegrationScenarios:
     """Test complete workflow scenarios."""
@@ -130,13 +130,25 @@ That concludes the analysis. Please proceed with implementation."""
             json.loads(extracted)
 
     def test_multiple_json_objects(self):
-        """Test that it extracts from first { to last } when multiple objects exist."""
+        """Test that only the first object is extracted when multiple exist."""
         test_response = """First object: {"a": 1} and second object: {"b": 2}"""
 
         extracted = extract_json_from_response(test_response)
 
-        # Should extract from first { to last }
-        assert extracted == """{"a": 1} and second object: {"b": 2}"""
+        # Should stop at the end of the first balanced object
+        assert extracted == """{"a": 1}"""
+
+    def test_json_followed_by_braces_in_prose(self):
+        """Test that braces in trailing prose are not included in the slice."""
+        test_response = """```json
+{"approved": true, "feedback": "Uses {placeholders}"}
+```
+Note: wrap values in {curly braces} when templating."""
+
+        extracted = extract_json_from_response(test_response)
+
+        assert extracted == """{"approved": true, "feedback": "Uses {placeholders}"}"""
+        assert json.loads(extracted)["approved"] is True
 
     def test_with_pydantic_models(self):
         """Test that extracted JSON works with Pydantic model validation."""
@@ -190,3 +202,57 @@ That concludes the analysis. Please proceed with implementation."""
         assert model.next_tool == "judge_code_change"
         assert "review" in model.reasoning
         assert len(model.preparation_needed) == 2
+
+
+class TestJsonParsing:
+    """Test parsing extracted JSON once, directly into the target model."""
+
+    def test_parses_markdown_wrapped_json(self):
+        """Test validating a fenced response with trailing prose in JSON mode."""
+        test_response = """```json
+{"approved": true, "required_improvements": [], "feedback": "ok {fine}"}
+```
+Let me know if you need {anything} else."""
+
+        model = JudgeResponse.model_validate_json(
+            extract_json_from_response(test_response)
+        )
+
+        assert model.approved is True
+        assert model.required_improvements == []
+        assert model.feedback == "ok {fine}"
+
+    def test_escaped_quotes_and_braces_in_strings(self):
+        """Test that escaped quotes do not end a string early while balancing."""
+        test_response = (
+            'Result: {"approved": false, "required_improvements": [], '
+            '"feedback": "Say \\"}\\" not {"} trailing }'
+        )
+
+        json_content = extract_json_from_response(test_response)
+
+        assert json.loads(json_content)["feedback"] == 'Say "}" not {'
+
+    def test_invalid_json_raises_value_error(self):
+        """Test that malformed objects surface as ValueError from validation."""
+        with pytest.raises(ValueError):
+            JudgeResponse.model_validate_json(
+                extract_json_from_response(
+                    "{ this is not valid JSON but has closing brace }"
+                )
+            )
+
+    def test_extracts_exact_object_text_for_json_validation(self):
+        """Test that only the first object's text is returned, not trailing braces."""
+        test_response = """Here you go:
+{"approved": false, "required_improvements": ["Add tests"], "feedback": "{x}"}
+Happy to expand on {this} later."""
+
+        json_content = extract_json_from_response(test_response)
+
+        assert json_content == (
+            '{"approved": false, "required_improvements": ["Add tests"], '
+            '"feedback": "{x}"}'
+        )
+        judge_response = JudgeResponse.model_validate_json(json_content)
+        assert judge_response.required_improvements == ["Add tests"]
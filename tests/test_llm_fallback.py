@@ -9,6 +9,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from mcp_as_a_judge.core import server_helpers
 from mcp_as_a_judge.llm.llm_integration import LLMConfig, LLMVendor
 from mcp_as_a_judge.messaging.llm_provider import llm_provider
 
@@ -123,3 +124,63 @@ class TestServerIntegration:
         assert hasattr(llm_provider, "check_capabilities")
         assert hasattr(llm_provider, "is_sampling_available")
         assert hasattr(llm_provider, "is_llm_api_available")
+
+
+class TestValidationErrorMessageCache:
+    """Test caching of AI-generated validation error messages."""
+
+    async def test_repeated_issue_reuses_generated_message(self):
+        """Identical validation failures should only sample the LLM once."""
+        server_helpers._validation_error_cache.clear()
+        send_message = AsyncMock(return_value="  Please add research URLs.  ")
+
+        with patch.object(llm_provider, "send_message", send_message):
+            first = await server_helpers.generate_validation_error_message(
+                "Insufficient research URLs", "context", MagicMock()
+            )
+            second = await server_helpers.generate_validation_error_message(
+                "Insufficient research URLs", "context", MagicMock()
+            )
+            other = await server_helpers.generate_validation_error_message(
+                "Insufficient research URLs", "different context", MagicMock()
+            )
+
+        assert first == second == other == "Please add research URLs."
+        assert send_message.await_count == 2
+        server_helpers._validation_error_cache.clear()
+
+    async def test_failed_generation_is_not_cached(self):
+        """Fallback to the raw issue should not be cached."""
+        server_helpers._validation_error_cache.clear()
+        send_message = AsyncMock(side_effect=RuntimeError("sampling failed"))
+
+        with patch.object(llm_provider, "send_message", send_message):
+            result = await server_helpers.generate_validation_error_message(
+                "Missing plan", "context", MagicMock()
+            )
+
+        assert result == "Missing plan"
+        assert not server_helpers._validation_error_cache
+
+
+class TestDynamicElicitationModelCache:
+    """Test caching of LLM-generated elicitation field definitions."""
+
+    async def test_same_context_reuses_field_definitions(self):
+        """Only the first elicitation for a context should sample the LLM."""
+        server_helpers._elicitation_fields_cache.clear()
+        send_message = AsyncMock(
+            return_value='{"decision": {"required": true, "description": "Pick"}}'
+        )
+
+        with patch.object(llm_provider, "send_message", send_message):
+            first = await server_helpers.generate_dynamic_elicitation_model(
+                "Obstacle", "Choose an option", "Problem A", MagicMock()
+            )
+            second = await server_helpers.generate_dynamic_elicitation_model(
+                "Obstacle", "Choose an option", "Problem B", MagicMock()
+            )
+
+        assert send_message.await_count == 1
+        assert set(first.model_fields) == set(second.model_fields) == {"decision"}
+        server_helpers._elicitation_fields_cache.clear()
@@ -7,9 +7,11 @@ import pytest
 from mcp_as_a_judge.models import (
     JudgeCodingPlanUserVars,
     SystemVars,
+    ValidationErrorUserVars,
 )
 from mcp_as_a_judge.prompting.loader import (
     PromptLoader,
+    _render_system_prompt,
     create_separate_messages,
     prompt_loader,
 )
@@ -36,6 +38,12 @@ class TestPromptLoader:
         assert template is not None
         assert hasattr(template, "render")
 
+    def test_load_template_is_memoized(self) -> None:
+        """Test that repeated loads return the same compiled template."""
+        first = prompt_loader.load_template("system/validation_error.md")
+        second = prompt_loader.load_template("system/validation_error.md")
+        assert first is second
+
     def test_load_template_not_found(self) -> None:
         """Test loading a non-existent template raises error."""
         with pytest.raises(
@@ -143,6 +151,20 @@ class TestPromptLoader:
         assert "## Plan" in prompt
         assert prompt.count("Test") >= 4  # Should appear at least 4 times (our inputs)
 
+    def test_conversation_history_rendered_as_compact_json(self) -> None:
+        """Test that conversation history is embedded as compact JSON."""
+        prompt = prompt_loader.render_prompt(
+            "user/judge_coding_plan.md",
+            user_requirements="Test",
+            plan="Test",
+            design="Test",
+            research="Test",
+            context="",
+            conversation_history=[{"source": "set_coding_task", "output": "ok"}],
+        )
+
+        assert '[{"source":"set_coding_task","output":"ok"}]' in prompt
+
     def test_global_prompt_loader_instance(self) -> None:
         """Test that the global prompt_loader instance works."""
         assert prompt_loader is not None
@@ -236,3 +258,19 @@ class TestPromptLoader:
         assert (loader.prompts_dir / "system").exists()
         assert (loader.prompts_dir / "user").exists()
         assert (loader.prompts_dir / "system" / "judge_coding_plan.md").exists()
+
+    def test_static_system_prompt_rendered_once(self) -> None:
+        """Test that identical system vars reuse the rendered system prompt."""
+        _render_system_prompt.cache_clear()
+        for issue in ("first issue", "second issue"):
+            messages = create_separate_messages(
+                "system/validation_error.md",
+                "user/validation_error.md",
+                SystemVars(),
+                ValidationErrorUserVars(validation_issue=issue, context=""),
+            )
+            assert issue in messages[1].content.text
+
+        info = _render_system_prompt.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
@@ -4,6 +4,7 @@ Comprehensive tests for SQLite provider SQL queries and edge cases.
 """
 
 import asyncio
+import uuid
 from datetime import UTC, datetime, timedelta
 
 import pytest
@@ -38,6 +39,23 @@ class TestSQLiteComprehensive:
         assert "tool_4" in sources
         assert "tool_3" in sources
 
+    @pytest.mark.asyncio
+    async def test_save_and_cleanup_share_one_commit(self):
+        """Test that a save and its FIFO cleanup are committed together."""
+        from sqlalchemy import event
+
+        db = SQLiteProvider(max_session_records=1)
+        await db.save_conversation("test_session", "tool_0", "input", "output")
+
+        commits: list[object] = []
+        event.listen(db.engine, "commit", commits.append)
+
+        await db.save_conversation("test_session", "tool_1", "input", "output")
+
+        assert len(commits) == 1
+        records = await db.get_session_conversations("test_session")
+        assert [r.source for r in records] == ["tool_1"]
+
     @pytest.mark.asyncio
     async def test_daily_cleanup_sql(self):
         """Test daily cleanup SQL with time-based deletion."""
@@ -72,6 +90,102 @@ class TestSQLiteComprehensive:
         deleted = await DatabaseTestUtils.clear_session(db, "nonexistent_session")
         assert deleted == 0
 
+    @pytest.mark.asyncio
+    async def test_session_conversations_pagination(self):
+        """Test cursor-based pagination of session conversations."""
+        db = SQLiteProvider(max_session_records=10)
+
+        for i in range(5):
+            await db.save_conversation(
+                session_id="paged_session",
+                source=f"tool_{i}",
+                input_data=f"input_{i}",
+                output=f"output_{i}",
+            )
+
+        first_page = await db.get_session_conversations("paged_session", limit=2)
+        second_page = await db.get_session_conversations(
+            "paged_session", limit=2, before_id=first_page[-1].id
+        )
+        last_page = await db.get_session_conversations(
+            "paged_session", limit=2, before_id=second_page[-1].id
+        )
+
+        assert [r.source for r in first_page] == ["tool_4", "tool_3"]
+        assert [r.source for r in second_page] == ["tool_2", "tool_1"]
+        assert [r.source for r in last_page] == ["tool_0"]
+
+    @pytest.mark.asyncio
+    async def test_session_conversations_within_budget(self):
+        """Test SQL-side token budget filtering of session conversations."""
+        db = SQLiteProvider(max_session_records=10)
+
+        for i in range(3):
+            await db.save_conversation(
+                session_id="budget_session",
+                source=f"tool_{i}",
+                input_data="x" * 400,  # 100 tokens
+                output="",
+            )
+
+        fitting = await db.get_session_conversations_within_budget(
+            "budget_session", token_budget=250
+        )
+        over_budget = await db.get_session_conversations_within_budget(
+            "budget_session", token_budget=50
+        )
+        limited = await db.get_session_conversations_within_budget(
+            "budget_session", token_budget=1000, limit=1
+        )
+
+        assert [r.source for r in fitting] == ["tool_2", "tool_1"]
+        # The most recent record is always kept
+        assert [r.source for r in over_budget] == ["tool_2"]
+        assert [r.source for r in limited] == ["tool_2"]
+
+    @pytest.mark.asyncio
+    async def test_delete_previous_plan(self):
+        """Test that only the most recent coding plan record is kept."""
+        db = SQLiteProvider(max_session_records=10)
+
+        for source in ("judge_coding_plan", "set_coding_task", "judge_coding_plan"):
+            await db.save_conversation(
+                session_id="plan_session",
+                source=source,
+                input_data="input",
+                output="output",
+            )
+        latest_plan_id = await db.save_conversation(
+            session_id="plan_session",
+            source="judge_coding_plan",
+            input_data="input",
+            output="output",
+        )
+
+        await db.delete_previous_plan("plan_session")
+
+        records = await db.get_session_conversations("plan_session")
+        assert [r.source for r in records] == ["judge_coding_plan", "set_coding_task"]
+        assert records[0].id == latest_plan_id
+
+    @pytest.mark.asyncio
+    async def test_record_ids_are_time_ordered(self):
+        """Test that record IDs are UUIDv7 carrying the record timestamp."""
+        db = SQLiteProvider()
+
+        record_id = await db.save_conversation(
+            session_id="uuid_session",
+            source="tool",
+            input_data="input",
+            output="output",
+        )
+        records = await db.get_session_conversations("uuid_session")
+
+        assert len(record_id) == 32
+        parsed = uuid.UUID(record_id)
+        assert parsed.version == 7
+        assert parsed.int >> 80 == records[0].timestamp // 1_000_000
+
     @pytest.mark.asyncio
     async def test_sql_injection_safety(self):
         """Verify SQL injection protection in all queries."""
@@ -153,6 +267,49 @@ class TestSQLiteComprehensive:
         for col in expected_columns:
             assert col in column_names
 
+    def test_file_database_pragmas(self, tmp_path):
+        """Test that file-based databases are opened in WAL mode."""
+        from sqlalchemy import text
+
+        db = SQLiteProvider(url=str(tmp_path / "history.db"))
+
+        with db.engine.connect() as connection:
+            journal_mode = connection.execute(text("PRAGMA journal_mode")).scalar()
+            synchronous = connection.execute(text("PRAGMA synchronous")).scalar()
+
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+
+    def test_in_memory_database_pragmas(self):
+        """Test that in-memory databases keep temp storage in memory."""
+        from sqlalchemy import text
+
+        db = SQLiteProvider()
+
+        with db.engine.connect() as connection:
+            temp_store = connection.execute(text("PRAGMA temp_store")).scalar()
+            cache_size = connection.execute(text("PRAGMA cache_size")).scalar()
+
+        assert temp_store == 2  # MEMORY
+        assert cache_size == -65536
+
+    @pytest.mark.asyncio
+    async def test_file_database_session_cleanup(self, tmp_path):
+        """Test LRU session cleanup against a file-based database."""
+        db = SQLiteProvider(url=str(tmp_path / "history.db"))
+        db._cleanup_service.max_total_sessions = 1
+
+        for session_id in ("old_session", "new_session"):
+            await db.save_conversation(
+                session_id=session_id,
+                source="tool",
+                input_data="input",
+                output="output",
+            )
+
+        assert db._cleanup_service.get_session_count() == 1
+        assert await db.get_session_conversations("old_session") == []
+
 
 if __name__ == "__main__":
     # Run tests directly